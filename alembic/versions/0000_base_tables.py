@@ -0,0 +1,30 @@
+"""Create the base tables
+
+On an empty database this creates the tables (and spatial extensions)
+exactly as init_db() does, so `alembic upgrade head` works without running
+the app first. Tables are created with checkfirst, and every later revision
+is safe to re-run against them. Databases already stamped at 0001 or later
+never run this. Like the rest of the chain it targets PostgreSQL; SQLite
+development databases are created by init_db() alone.
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+from app.database import Base, init_db
+
+revision = "0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    init_db(op.get_bind())
+
+
+def downgrade():
+    Base.metadata.drop_all(bind=op.get_bind())
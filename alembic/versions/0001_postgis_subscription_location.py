@@ -0,0 +1,62 @@
+"""Add PostGIS location columns and severity level to subscriptions
+
+Tables created by init_db() already have these columns, so every
+statement is written to be safe to re-run.
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+from app.config import settings
+
+revision = "0001"
+down_revision = "0000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TABLE alert_subscriptions ADD COLUMN IF NOT EXISTS min_severity_level smallint")
+    op.execute(
+        """
+        UPDATE alert_subscriptions SET min_severity_level = CASE min_severity
+            WHEN 'Low' THEN 0
+            WHEN 'Medium' THEN 1
+            WHEN 'High' THEN 2
+            WHEN 'Critical' THEN 3
+            ELSE 0
+        END
+        WHERE min_severity_level IS NULL
+        """
+    )
+    
+    if settings.SPATIAL_BACKEND != "postgis":
+        return
+    
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    
+    op.execute("ALTER TABLE flood_events ADD COLUMN IF NOT EXISTS location geometry(Point, 4326)")
+    op.execute(
+        "UPDATE flood_events SET location = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326) "
+        "WHERE location IS NULL"
+    )
+    
+    op.execute("ALTER TABLE alert_subscriptions ADD COLUMN IF NOT EXISTS location geometry(Point, 4326)")
+    op.execute(
+        "UPDATE alert_subscriptions SET location = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326) "
+        "WHERE location IS NULL"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_subs_location ON alert_subscriptions "
+        "USING GIST ((location::geography(Point, 4326)))"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_subs_location")
+    op.execute("ALTER TABLE alert_subscriptions DROP COLUMN IF EXISTS min_severity_level")
+    op.execute("ALTER TABLE alert_subscriptions DROP COLUMN IF EXISTS location")
+    op.execute("ALTER TABLE flood_events DROP COLUMN IF EXISTS location")
@@ -0,0 +1,29 @@
+"""Add SP-GiST index on flood_events.location
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+from app.config import settings
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if settings.SPATIAL_BACKEND != "postgis":
+        return
+    
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS flood_events_loc_spgist ON flood_events "
+        "USING SPGIST ((location::geography(Point, 4326)))"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS flood_events_loc_spgist")
@@ -0,0 +1,38 @@
+"""Add cube/earthdistance GiST indexes for databases without PostGIS
+
+Only applied when SPATIAL_BACKEND is "earthdistance".
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+from app.config import settings
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if settings.SPATIAL_BACKEND != "earthdistance":
+        return
+    
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_flood_events_earth ON flood_events "
+        "USING GIST (ll_to_earth(latitude, longitude))"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_subs_earth ON alert_subscriptions "
+        "USING GIST (ll_to_earth(latitude, longitude))"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_subs_earth")
+    op.execute("DROP INDEX IF EXISTS ix_flood_events_earth")
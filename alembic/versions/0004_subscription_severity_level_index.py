@@ -0,0 +1,39 @@
+"""Make alert_subscriptions.min_severity_level NOT NULL and index it
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows inserted between 0001 and this revision by older code
+    op.execute(
+        """
+        UPDATE alert_subscriptions SET min_severity_level = CASE min_severity
+            WHEN 'Low' THEN 0
+            WHEN 'Medium' THEN 1
+            WHEN 'High' THEN 2
+            WHEN 'Critical' THEN 3
+            ELSE 0
+        END
+        WHERE min_severity_level IS NULL
+        """
+    )
+    op.execute("ALTER TABLE alert_subscriptions ALTER COLUMN min_severity_level SET NOT NULL")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_alert_subscriptions_min_severity_level "
+        "ON alert_subscriptions (min_severity_level)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_alert_subscriptions_min_severity_level")
+    op.execute("ALTER TABLE alert_subscriptions ALTER COLUMN min_severity_level DROP NOT NULL")
@@ -0,0 +1,24 @@
+"""Add covering (severity, timestamp DESC) index on flood_events
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_flood_events_sev_ts ON flood_events (severity, timestamp DESC) "
+        "INCLUDE (id, location_name, latitude, longitude, risk_score, rainfall_mm, elevation_m)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_flood_events_sev_ts")
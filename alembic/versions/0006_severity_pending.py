@@ -0,0 +1,26 @@
+"""Add PENDING to the severitylevel enum
+
+Flood events are stored as PENDING until their risk has been calculated.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE severitylevel ADD VALUE IF NOT EXISTS 'PENDING'")
+
+
+def downgrade():
+    # Postgres cannot drop enum values; finished rows never use PENDING
+    pass
@@ -0,0 +1,26 @@
+"""Add flood_events.updated_at for HTTP ETags
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "ALTER TABLE flood_events ADD COLUMN IF NOT EXISTS updated_at "
+        "timestamp with time zone NOT NULL DEFAULT now()"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_flood_events_updated_at ON flood_events (updated_at)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_flood_events_updated_at")
+    op.execute("ALTER TABLE flood_events DROP COLUMN IF EXISTS updated_at")
@@ -0,0 +1,51 @@
+"""Store alert_subscriptions.location as geography with a GiST index
+
+The previous index was on the expression location::geography; with a
+native geography column ST_DWithin uses a plain GiST index on the
+column itself.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+from app.config import settings
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if settings.SPATIAL_BACKEND != "postgis":
+        return
+    
+    op.execute("DROP INDEX IF EXISTS ix_subs_location")
+    op.execute(
+        "ALTER TABLE alert_subscriptions ALTER COLUMN location "
+        "TYPE geography(Point, 4326) USING location::geography(Point, 4326)"
+    )
+    op.execute(
+        "UPDATE alert_subscriptions "
+        "SET location = ST_MakePoint(longitude, latitude)::geography(Point, 4326) "
+        "WHERE location IS NULL"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS subs_geo_idx ON alert_subscriptions USING GIST (location)")
+
+
+def downgrade():
+    if settings.SPATIAL_BACKEND != "postgis":
+        return
+    
+    op.execute("DROP INDEX IF EXISTS subs_geo_idx")
+    op.execute(
+        "ALTER TABLE alert_subscriptions ALTER COLUMN location "
+        "TYPE geometry(Point, 4326) USING location::geometry(Point, 4326)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_subs_location ON alert_subscriptions "
+        "USING GIST ((location::geography(Point, 4326)))"
+    )
@@ -0,0 +1,34 @@
+"""Add latitude/longitude B-tree indexes for the bbox spatial backend
+
+Only applied when SPATIAL_BACKEND is "bbox".
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+from app.config import settings
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if settings.SPATIAL_BACKEND != "bbox":
+        return
+    
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_flood_events_lat_lon ON flood_events (latitude, longitude)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_subs_lat_lon ON alert_subscriptions (latitude, longitude)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_subs_lat_lon")
+    op.execute("DROP INDEX IF EXISTS ix_flood_events_lat_lon")
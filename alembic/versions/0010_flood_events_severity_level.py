@@ -0,0 +1,36 @@
+"""Add numeric flood_events.severity_level
+
+Mirrors alert_subscriptions.min_severity_level so severity thresholds are
+integer comparisons. NULL while an event is still Pending.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TABLE flood_events ADD COLUMN IF NOT EXISTS severity_level smallint")
+    # The enum column stores member names
+    op.execute(
+        """
+        UPDATE flood_events SET severity_level = CASE severity
+            WHEN 'LOW' THEN 0
+            WHEN 'MEDIUM' THEN 1
+            WHEN 'HIGH' THEN 2
+            WHEN 'CRITICAL' THEN 3
+        END
+        WHERE severity_level IS NULL
+        """
+    )
+
+
+def downgrade():
+    op.execute("ALTER TABLE flood_events DROP COLUMN IF EXISTS severity_level")
@@ -0,0 +1,24 @@
+"""Add alert_subscriptions.updated_at for HTTP ETags
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "ALTER TABLE alert_subscriptions ADD COLUMN IF NOT EXISTS updated_at "
+        "timestamp with time zone NOT NULL DEFAULT now()"
+    )
+
+
+def downgrade():
+    op.execute("ALTER TABLE alert_subscriptions DROP COLUMN IF EXISTS updated_at")
@@ -0,0 +1,27 @@
+"""Add FAILED to the severitylevel enum
+
+Flood events whose background risk calculation raised are stored as FAILED
+instead of staying PENDING.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE severitylevel ADD VALUE IF NOT EXISTS 'FAILED'")
+
+
+def downgrade():
+    # Postgres cannot drop enum values
+    pass
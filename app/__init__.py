@@ -1,5 +1,5 @@
 """App package initialization."""
-from .config import settings
+from .config import settings, get_settings
 
 __version__ = "1.0.0"
-__all__ = ["settings"]
+__all__ = ["settings", "get_settings"]
@@ -4,7 +4,8 @@ Uses Pydantic Settings for environment variable management.
 """
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from functools import cached_property, lru_cache
+from typing import Literal, Optional
 from pathlib import Path
 
 # Get the project root directory (parent of app/)
@@ -16,6 +17,15 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # Spatial query backend: "postgis" (default), "earthdistance"
+    # (cube + earthdistance extensions, for databases without PostGIS) or
+    # "bbox" (plain lat/lon B-tree index, no extensions needed)
+    SPATIAL_BACKEND: Literal["postgis", "earthdistance", "bbox"] = "postgis"
+    # Connection pool tuning
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
     
     # API Keys
     OPENWEATHERMAP_API_KEY: str
@@ -30,7 +40,15 @@ class Settings(BaseSettings):
     # Application
     APP_NAME: str = "Hyperlocal Urban Flood Forecaster"
     DEBUG: bool = False
+    LOG_LEVEL: str = "INFO"  # level for the app.* loggers
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
+    # Origins a static list can't express: the project's own Netlify sites and
+    # their deploy previews / branch deploys (<prefix>--<site>.netlify.app).
+    # Credentialed CORS is allowed, so never widen this to all of netlify.app
+    CORS_ORIGIN_REGEX: Optional[str] = r"https://([a-z0-9-]+--)?floodaura(aa)?\.netlify\.app"
+    # Comma-separated router modules to leave out (e.g. "chat,route_verdict");
+    # disabled routers are never imported
+    DISABLED_ROUTERS: str = ""
     
     # Optional: Notification Services
     TWILIO_ACCOUNT_SID: Optional[str] = None
@@ -42,6 +60,13 @@ class Settings(BaseSettings):
     SMTP_PORT: Optional[int] = 587
     SMTP_EMAIL: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
+    SMTP_POOL_SIZE: int = 5  # persistent SMTP sessions shared by all sends
+    SMTP_BCC_BATCH_SIZE: int = 50  # recipients per bulk email; provider limits vary
+    RICH_EMAIL_ENABLED: bool = True  # False sends plain text only (no HTML part)
+    
+    # Optional: Redis for the notification job queue (run worker.py);
+    # without it emails are sent from the API process
+    REDIS_URL: Optional[str] = None
     
     model_config = SettingsConfigDict(
         env_file=str(PROJECT_ROOT / ".env"),
@@ -50,11 +75,26 @@ class Settings(BaseSettings):
         extra="ignore"  # Ignore extra fields like REACT_APP_* variables
     )
     
-    @property
-    def cors_origins(self) -> list[str]:
-        """Parse CORS origins from comma-separated string."""
-        return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+    @cached_property
+    def cors_origins(self) -> tuple[str, ...]:
+        """Parse CORS origins from comma-separated string (computed once)."""
+        return tuple(origin.strip() for origin in self.ALLOWED_ORIGINS.split(",") if origin.strip())
+    
+    @cached_property
+    def disabled_routers(self) -> frozenset[str]:
+        """Parse DISABLED_ROUTERS from comma-separated string (computed once)."""
+        return frozenset(name.strip() for name in self.DISABLED_ROUTERS.split(",") if name.strip())
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Return the cached Settings instance.
+    .env and environment variables are parsed once per process; use as a
+    FastAPI dependency (override in tests via app.dependency_overrides).
+    """
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -3,11 +3,148 @@ CRUD operations for database models.
 Provides functions for Create, Read, Update, Delete operations.
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List, Optional
+from cachetools import TTLCache
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import Row, ScalarResult, and_, desc, func, cast, insert, lambda_stmt, or_, select, text
+from sqlalchemy.sql.elements import ColumnElement
+from geoalchemy2 import WKTElement
+from typing import List, Optional, Tuple, Union
+import math
+import threading
 from . import models, schemas
-from datetime import datetime
+from .config import settings
+
+
+# Upper bound on AlertSubscription.radius_km (enforced by the schemas).
+# Used as a constant ST_DWithin distance so the spatial index can prune
+# candidates before the per-row radius is checked.
+MAX_SUBSCRIPTION_RADIUS_KM = 50.0
+
+# Rows per fetch when streaming subscription lists
+SUBSCRIPTION_FETCH_BATCH = 100
+
+# Alert fan-out cache: candidate subscribers per grid cell (and severity
+# level), so bursts of alerts for co-located events reuse one spatial query.
+# Cleared on any subscription change; the TTL bounds staleness across workers.
+SUBSCRIBER_CELL_DEGREES = 0.25  # ~28 km
+SUBSCRIBER_CACHE_TTL = 60  # seconds
+_subscriber_cache: TTLCache = TTLCache(maxsize=10_000, ttl=SUBSCRIBER_CACHE_TTL)
+_subscriber_cache_lock = threading.Lock()  # crud runs in worker threads
+
+
+# Columns needed by FloodEventResponse / UserResponse; list queries load only
+# these (skips the geometry column and password hashes)
+_FLOOD_EVENT_LIST_COLUMNS = (
+    models.FloodEvent.id,
+    models.FloodEvent.location_name,
+    models.FloodEvent.latitude,
+    models.FloodEvent.longitude,
+    models.FloodEvent.severity,
+    models.FloodEvent.risk_score,
+    models.FloodEvent.timestamp,
+    models.FloodEvent.rainfall_mm,
+    models.FloodEvent.elevation_m,
+    models.FloodEvent.description,
+)
+_USER_LIST_COLUMNS = (
+    models.User.id,
+    models.User.email,
+    models.User.username,
+    models.User.is_active,
+    models.User.is_admin,
+    models.User.created_at,
+)
+
+# Base statement for get_flood_events. lambda_stmt caches the SQL construction
+# (and compilation) by code location; per-call values become bound parameters
+_FLOOD_EVENT_LIST_STMT = lambda_stmt(
+    lambda: select(models.FloodEvent).options(load_only(*_FLOOD_EVENT_LIST_COLUMNS))
+)
+
+
+def _point(latitude: float, longitude: float) -> WKTElement:
+    """Build a PostGIS point (SRID 4326) from latitude/longitude."""
+    return WKTElement(f"POINT({longitude} {latitude})", srid=4326)
+
+
+def _spatial_columns(latitude: float, longitude: float) -> dict:
+    """Extra column values required by the configured spatial backend."""
+    if models.USE_POSTGIS:
+        return {"location": _point(latitude, longitude)}
+    return {}
+
+
+# earthdistance predicates: the earth_box check uses the GiST index on
+# ll_to_earth(latitude, longitude), earth_distance trims the box corners
+_EARTH_BOX_FILTER = text(
+    "earth_box(ll_to_earth(:lat, :lon), :box_radius_m) @> ll_to_earth(latitude, longitude)"
+)
+_EARTH_DISTANCE_FILTER = text(
+    "earth_distance(ll_to_earth(:lat, :lon), ll_to_earth(latitude, longitude)) <= :radius_m"
+)
+_EARTH_DISTANCE_RADIUS_FILTER = text(
+    "earth_distance(ll_to_earth(:lat, :lon), ll_to_earth(latitude, longitude)) <= radius_km * 1000"
+)
+
+
+# Shortest length of one degree of latitude (at the equator), so the
+# bounding box never cuts off points that are inside the radius
+_KM_PER_DEGREE = 110.5
+_EARTH_RADIUS_KM = 6371.0
+
+
+def _bounding_box(model, latitude: float, longitude: float, radius_km: float) -> ColumnElement:
+    """
+    Build a latitude/longitude range filter enclosing a circle (bbox backend).
+    Served by the (latitude, longitude) B-tree index; handles boxes that
+    reach a pole or cross the antimeridian.
+    """
+    dlat = radius_km / _KM_PER_DEGREE
+    lat_filter = model.latitude.between(latitude - dlat, latitude + dlat)
+    
+    # Longitude degrees shrink towards the poles; size the box for its
+    # most poleward edge
+    edge_lat = abs(latitude) + dlat
+    if edge_lat >= 90:
+        return lat_filter
+    dlon = radius_km / (_KM_PER_DEGREE * math.cos(math.radians(edge_lat)))
+    if dlon >= 180:
+        return lat_filter
+    
+    west, east = longitude - dlon, longitude + dlon
+    if west < -180:
+        lon_filter = or_(model.longitude >= west + 360, model.longitude <= east)
+    elif east > 180:
+        lon_filter = or_(model.longitude >= west, model.longitude <= east - 360)
+    else:
+        lon_filter = model.longitude.between(west, east)
+    return and_(lat_filter, lon_filter)
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in km."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * _EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _severity_level(severity: Union[str, int, None]) -> int:
+    """
+    Numeric severity (see models.SEVERITY_LEVELS) for a level name or an already numeric level.
+    
+    Raises:
+        ValueError: For None or a name without a rank (e.g. "Pending"), so an
+            unknown severity never silently matches as the lowest level
+    """
+    if isinstance(severity, int):
+        return severity
+    try:
+        return models.SEVERITY_LEVELS[severity]
+    except KeyError:
+        raise ValueError(f"Unknown severity level: {severity!r}") from None
 
 
 # Flood Event CRUD Operations
@@ -39,11 +176,13 @@ def create_flood_event(
         latitude=flood_event.latitude,
         longitude=flood_event.longitude,
         severity=severity,
+        severity_level=models.SEVERITY_LEVELS.get(severity),
         risk_score=risk_score,
         rainfall_mm=rainfall_mm,
         elevation_m=elevation_m,
         description=flood_event.description,
-        timestamp=datetime.utcnow()
+        **_spatial_columns(flood_event.latitude, flood_event.longitude)
+        # timestamp is filled in by the column's server_default (now())
     )
     db.add(db_flood_event)
     db.commit()
@@ -51,6 +190,96 @@ def create_flood_event(
     return db_flood_event
 
 
+def update_flood_event_risk(
+    db: Session,
+    flood_id: int,
+    risk_score: float,
+    severity: str,
+    rainfall_mm: float,
+    elevation_m: float
+) -> Optional[models.FloodEvent]:
+    """
+    Store calculated risk data on an existing (pending) flood event.
+    
+    Args:
+        db: Database session
+        flood_id: ID of the flood event
+        risk_score: Calculated risk score (0-100)
+        severity: Calculated severity level
+        rainfall_mm: Rainfall amount in mm
+        elevation_m: Elevation in meters
+    
+    Returns:
+        Updated FloodEvent model instance or None if not found
+    """
+    db_flood_event = get_flood_event(db, flood_id)
+    if db_flood_event is None:
+        return None
+    
+    db_flood_event.risk_score = risk_score
+    db_flood_event.severity = severity
+    db_flood_event.severity_level = models.SEVERITY_LEVELS.get(severity)
+    db_flood_event.rainfall_mm = rainfall_mm
+    db_flood_event.elevation_m = elevation_m
+    db.commit()
+    db.refresh(db_flood_event)
+    return db_flood_event
+
+
+def mark_flood_event_failed(db: Session, flood_id: int) -> Optional[models.FloodEvent]:
+    """
+    Mark a pending flood event whose risk calculation failed.
+    
+    Args:
+        db: Database session
+        flood_id: ID of the flood event
+    
+    Returns:
+        Updated FloodEvent model instance or None if not found
+    """
+    db_flood_event = get_flood_event(db, flood_id)
+    if db_flood_event is None:
+        return None
+    
+    db_flood_event.severity = models.SeverityLevel.FAILED
+    db_flood_event.severity_level = None
+    db.commit()
+    db.refresh(db_flood_event)
+    return db_flood_event
+
+
+def bulk_create_flood_events(db: Session, events: List[dict]) -> List[int]:
+    """
+    Insert many flood events in a single round-trip (e.g. for backfills).
+    
+    Args:
+        db: Database session
+        events: Column values per event (location_name, latitude, longitude,
+            severity, risk_score and optionally rainfall_mm, elevation_m,
+            description, timestamp)
+    
+    Returns:
+        IDs of the created flood events, in input order
+    """
+    if not events:
+        return []
+    
+    rows = [
+        {
+            **event,
+            "severity_level": models.SEVERITY_LEVELS.get(event["severity"]),
+            **_spatial_columns(event["latitude"], event["longitude"])
+        }
+        for event in events
+    ]
+    ids = list(db.scalars(
+        insert(models.FloodEvent).returning(models.FloodEvent.id, sort_by_parameter_order=True),
+        rows
+    ))
+    db.commit()
+    return ids
+
+
 def get_flood_event(db: Session, flood_id: int) -> Optional[models.FloodEvent]:
     """
     Get a single flood event by ID.
@@ -62,7 +291,7 @@ def get_flood_event(db: Session, flood_id: int) -> Optional[models.FloodEvent]:
     Returns:
         FloodEvent model instance or None if not found
     """
-    return db.query(models.FloodEvent).filter(models.FloodEvent.id == flood_id).first()
+    return db.get(models.FloodEvent, flood_id)
 
 
 def get_flood_events(
@@ -83,16 +312,18 @@ def get_flood_events(
     Returns:
         List of FloodEvent model instances
     """
-    query = db.query(models.FloodEvent)
+    stmt = _FLOOD_EVENT_LIST_STMT
     
     # Filter by severity if provided
     if severity:
-        query = query.filter(models.FloodEvent.severity == severity)
+        stmt = stmt.add_criteria(lambda s: s.where(models.FloodEvent.severity == severity))
     
-    # Order by most recent first
-    query = query.order_by(desc(models.FloodEvent.timestamp))
+    # Most recent first, paginated
+    stmt = stmt.add_criteria(
+        lambda s: s.order_by(desc(models.FloodEvent.timestamp)).offset(skip).limit(limit)
+    )
     
-    return query.offset(skip).limit(limit).all()
+    return db.scalars(stmt).all()
 
 
 def get_flood_events_by_location(
@@ -102,8 +333,11 @@ def get_flood_events_by_location(
     radius_km: float = 5.0
 ) -> List[models.FloodEvent]:
     """
-    Get flood events near a specific location (simplified version).
-    For production, use PostGIS for proper geographic queries.
+    Get flood events near a specific location.
+    Uses PostGIS ST_DWithin on geography, backed by the SP-GiST index
+    on flood_events.location, earth_box/earth_distance when
+    SPATIAL_BACKEND is "earthdistance", or a lat/lon bounding box plus
+    an exact haversine check on the matches when it is "bbox".
     
     Args:
         db: Database session
@@ -114,15 +348,28 @@ def get_flood_events_by_location(
     Returns:
         List of FloodEvent model instances
     """
-    # Simplified bounding box calculation (not accurate for large areas)
-    # For production, use PostGIS ST_Distance_Sphere or similar
-    lat_delta = radius_km / 111.0  # Approximate km per degree latitude
-    lon_delta = radius_km / (111.0 * abs(float(latitude)))  # Adjust for latitude
+    query = db.query(models.FloodEvent)
+    
+    if models.USE_POSTGIS:
+        query = query.filter(
+            func.ST_DWithin(
+                cast(models.FloodEvent.location, models.GEOGRAPHY_POINT),
+                cast(_point(latitude, longitude), models.GEOGRAPHY_POINT),
+                radius_km * 1000
+            )
+        )
+    elif settings.SPATIAL_BACKEND == "earthdistance":
+        query = query.filter(_EARTH_BOX_FILTER, _EARTH_DISTANCE_FILTER).params(
+            lat=latitude, lon=longitude, box_radius_m=radius_km * 1000, radius_m=radius_km * 1000
+        )
+    else:
+        query = query.filter(_bounding_box(models.FloodEvent, latitude, longitude, radius_km))
+        return [
+            event for event in query.order_by(desc(models.FloodEvent.timestamp))
+            if _haversine_km(latitude, longitude, event.latitude, event.longitude) <= radius_km
+        ]
     
-    return db.query(models.FloodEvent).filter(
-        models.FloodEvent.latitude.between(latitude - lat_delta, latitude + lat_delta),
-        models.FloodEvent.longitude.between(longitude - lon_delta, longitude + lon_delta)
-    ).order_by(desc(models.FloodEvent.timestamp)).all()
+    return query.order_by(desc(models.FloodEvent.timestamp)).all()
 
 
 def delete_flood_event(db: Session, flood_id: int) -> bool:
@@ -146,6 +393,11 @@ def delete_flood_event(db: Session, flood_id: int) -> bool:
 
 # User CRUD Operations (Optional, for authentication)
 
+def get_user(db: Session, user_id: int) -> Optional[models.User]:
+    """Get user by ID."""
+    return db.get(models.User, user_id)
+
+
 def get_user_by_username(db: Session, username: str) -> Optional[models.User]:
     """Get user by username."""
     return db.query(models.User).filter(models.User.username == username).first()
@@ -182,8 +434,10 @@ def create_user(db: Session, user: schemas.UserCreate, hashed_password: str) ->
 
 
 def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[models.User]:
-    """Get list of users."""
-    return db.query(models.User).offset(skip).limit(limit).all()
+    """Get list of users (only the columns exposed by UserResponse)."""
+    return db.query(models.User).options(
+        load_only(*_USER_LIST_COLUMNS)
+    ).offset(skip).limit(limit).all()
 
 
 # Alert Subscription CRUD Operations
@@ -209,19 +463,20 @@ def create_subscription(
         longitude=subscription.longitude,
         radius_km=subscription.radius_km,
         min_severity=subscription.min_severity,
+        min_severity_level=_severity_level(subscription.min_severity),
+        **_spatial_columns(subscription.latitude, subscription.longitude),
         is_active=1
     )
     db.add(db_subscription)
     db.commit()
+    _invalidate_subscriber_cache()
     db.refresh(db_subscription)
     return db_subscription
 
 
 def get_subscription(db: Session, subscription_id: int) -> Optional[models.AlertSubscription]:
     """Get subscription by ID."""
-    return db.query(models.AlertSubscription).filter(
-        models.AlertSubscription.id == subscription_id
-    ).first()
+    return db.get(models.AlertSubscription, subscription_id)
 
 
 def get_subscriptions(
@@ -229,56 +484,186 @@ def get_subscriptions(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True
-) -> List[models.AlertSubscription]:
-    """Get list of subscriptions."""
-    query = db.query(models.AlertSubscription)
+) -> ScalarResult[models.AlertSubscription]:
+    """
+    Get list of subscriptions.
+    Rows are fetched SUBSCRIPTION_FETCH_BATCH at a time (a server-side cursor
+    on PostgreSQL), so iterate the result while the session is still open.
+    """
+    stmt = select(models.AlertSubscription)
     
     if active_only:
-        query = query.filter(models.AlertSubscription.is_active == 1)
+        stmt = stmt.where(models.AlertSubscription.is_active == 1)
     
-    return query.offset(skip).limit(limit).all()
+    return db.scalars(
+        stmt.offset(skip).limit(limit).execution_options(yield_per=SUBSCRIPTION_FETCH_BATCH)
+    )
 
 
 def get_subscriptions_near_location(
     db: Session,
     latitude: float,
     longitude: float,
-    min_severity: str = "Low"
-) -> List[models.AlertSubscription]:
+    min_severity: Union[str, int, None] = "Low"
+) -> List[Row]:
     """
-    Get subscriptions that should be notified for a location.
+    Get contact details of subscriptions that should be notified for a location.
+    Uses PostGIS ST_DWithin on the geography location column so distances
+    are true metres and its GiST index prunes candidates before any
+    distance is evaluated (earth_box/earth_distance when SPATIAL_BACKEND
+    is "earthdistance", a lat/lon bounding box plus exact haversine
+    check when it is "bbox").
     
     Args:
         db: Database session
         latitude: Event latitude
         longitude: Event longitude
-        min_severity: Event severity level
+        min_severity: Event severity (name, or numeric FloodEvent.severity_level)
     
     Returns:
-        List of subscriptions within radius
+        List of (email, phone) rows for subscriptions within radius.
+        A Core select of just these columns (plus latitude/longitude/radius_km
+        for the "bbox" distance check): no ORM objects are materialized.
+    """
+    event_severity_level = _severity_level(min_severity)
+    stmt = select(
+        models.AlertSubscription.email,
+        models.AlertSubscription.phone
+    ).where(
+        models.AlertSubscription.is_active == 1,
+        models.AlertSubscription.min_severity_level <= event_severity_level
+    )
+    
+    if models.USE_POSTGIS:
+        sub_location = models.AlertSubscription.location
+        event_location = cast(func.ST_MakePoint(longitude, latitude), models.GEOGRAPHY_POINT)
+        stmt = stmt.where(
+            # Constant distance: index-assisted prefilter
+            func.ST_DWithin(sub_location, event_location, MAX_SUBSCRIPTION_RADIUS_KM * 1000),
+            # Per-subscription radius: exact check on the remaining rows
+            func.ST_DWithin(sub_location, event_location, models.AlertSubscription.radius_km * 1000)
+        )
+    elif settings.SPATIAL_BACKEND == "earthdistance":
+        stmt = stmt.where(
+            _EARTH_BOX_FILTER.bindparams(
+                lat=latitude, lon=longitude, box_radius_m=MAX_SUBSCRIPTION_RADIUS_KM * 1000
+            ),
+            _EARTH_DISTANCE_RADIUS_FILTER.bindparams(lat=latitude, lon=longitude)
+        )
+    else:
+        # Box sized for the largest allowed radius; each subscription's own
+        # radius is checked in Python on the few rows left
+        stmt = stmt.add_columns(
+            models.AlertSubscription.latitude,
+            models.AlertSubscription.longitude,
+            models.AlertSubscription.radius_km
+        ).where(
+            _bounding_box(models.AlertSubscription, latitude, longitude, MAX_SUBSCRIPTION_RADIUS_KM)
+        )
+        return [
+            row for row in db.execute(stmt)
+            if _haversine_km(latitude, longitude, row.latitude, row.longitude) <= row.radius_km
+        ]
+    
+    return db.execute(stmt).all()
+
+
+def _subscriber_cell_candidates(db: Session, cell: Tuple[int, int, int]) -> List[Row]:
+    """
+    Query every active subscription that could be alerted by an event
+    anywhere in a grid cell: within MAX_SUBSCRIPTION_RADIUS_KM of the cell
+    plus the distance from its centre to the farthest corner.
+    """
+    lat_index, lon_index, severity_level = cell
+    south, west = lat_index * SUBSCRIBER_CELL_DEGREES, lon_index * SUBSCRIBER_CELL_DEGREES
+    center_lat = south + SUBSCRIBER_CELL_DEGREES / 2
+    center_lon = west + SUBSCRIBER_CELL_DEGREES / 2
+    search_radius_km = MAX_SUBSCRIPTION_RADIUS_KM + max(
+        _haversine_km(center_lat, center_lon, corner_lat, corner_lon)
+        for corner_lat in (south, south + SUBSCRIBER_CELL_DEGREES)
+        for corner_lon in (west, west + SUBSCRIBER_CELL_DEGREES)
+    )
+    
+    stmt = select(
+        models.AlertSubscription.email,
+        models.AlertSubscription.phone,
+        models.AlertSubscription.latitude,
+        models.AlertSubscription.longitude,
+        models.AlertSubscription.radius_km
+    ).where(
+        models.AlertSubscription.is_active == 1,
+        models.AlertSubscription.min_severity_level <= severity_level
+    )
+    
+    if models.USE_POSTGIS:
+        stmt = stmt.where(
+            func.ST_DWithin(
+                models.AlertSubscription.location,
+                cast(func.ST_MakePoint(center_lon, center_lat), models.GEOGRAPHY_POINT),
+                search_radius_km * 1000
+            )
+        )
+    elif settings.SPATIAL_BACKEND == "earthdistance":
+        stmt = stmt.where(
+            _EARTH_BOX_FILTER.bindparams(
+                lat=center_lat, lon=center_lon, box_radius_m=search_radius_km * 1000
+            ),
+            _EARTH_DISTANCE_FILTER.bindparams(
+                lat=center_lat, lon=center_lon, radius_m=search_radius_km * 1000
+            )
+        )
+    else:
+        stmt = stmt.where(
+            _bounding_box(models.AlertSubscription, center_lat, center_lon, search_radius_km)
+        )
+    
+    return db.execute(stmt).all()
+
+
+def get_cached_subscriptions_near_location(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    min_severity: Union[str, int, None] = "Low"
+) -> List[Row]:
     """
-    # Severity order: Low < Medium < High < Critical
-    severity_order = {"Low": 0, "Medium": 1, "High": 2, "Critical": 3}
-    event_severity_level = severity_order.get(min_severity, 0)
+    Cached variant of get_subscriptions_near_location for alert fan-out.
+    Candidates for the event's grid cell come from an in-process TTL cache
+    (one spatial query per cell and severity level); each candidate's own
+    radius is then checked exactly in Python.
     
-    subscriptions = db.query(models.AlertSubscription).filter(
-        models.AlertSubscription.is_active == 1
-    ).all()
+    Args:
+        db: Database session
+        latitude: Event latitude
+        longitude: Event longitude
+        min_severity: Event severity (name, or numeric FloodEvent.severity_level)
     
-    # Filter subscriptions within radius and matching severity
-    matching_subs = []
-    for sub in subscriptions:
-        # Calculate approximate distance (simplified)
-        lat_diff = abs(sub.latitude - latitude)
-        lon_diff = abs(sub.longitude - longitude)
-        approx_dist_km = ((lat_diff ** 2 + lon_diff ** 2) ** 0.5) * 111  # Rough km conversion
-        
-        sub_severity_level = severity_order.get(sub.min_severity, 0)
-        
-        if approx_dist_km <= sub.radius_km and event_severity_level >= sub_severity_level:
-            matching_subs.append(sub)
+    Returns:
+        List of (email, phone, latitude, longitude, radius_km) rows for
+        subscriptions within radius
+    """
+    cell = (
+        math.floor(latitude / SUBSCRIBER_CELL_DEGREES),
+        math.floor(longitude / SUBSCRIBER_CELL_DEGREES),
+        _severity_level(min_severity),
+    )
+    with _subscriber_cache_lock:
+        candidates = _subscriber_cache.get(cell)
+    if candidates is None:
+        candidates = _subscriber_cell_candidates(db, cell)
+        with _subscriber_cache_lock:
+            _subscriber_cache[cell] = candidates
     
-    return matching_subs
+    return [
+        row for row in candidates
+        if _haversine_km(latitude, longitude, row.latitude, row.longitude) <= row.radius_km
+    ]
+
+
+def _invalidate_subscriber_cache():
+    """Drop cached alert candidates after a subscription is created, changed or deleted."""
+    with _subscriber_cache_lock:
+        _subscriber_cache.clear()
 
 
 def update_subscription(
@@ -291,11 +676,16 @@ def update_subscription(
     if not db_subscription:
         return None
     
-    update_data = subscription_update.dict(exclude_unset=True)
+    update_data = subscription_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_subscription, field, value)
     
+    # Keep the numeric severity level in sync with the string value
+    if "min_severity" in update_data:
+        db_subscription.min_severity_level = _severity_level(db_subscription.min_severity)
+    
     db.commit()
+    _invalidate_subscriber_cache()
     db.refresh(db_subscription)
     return db_subscription
 
@@ -306,5 +696,6 @@ def delete_subscription(db: Session, subscription_id: int) -> bool:
     if subscription:
         db.delete(subscription)
         db.commit()
+        _invalidate_subscriber_cache()
         return True
     return False
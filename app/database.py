@@ -3,14 +3,26 @@ Database configuration and session management.
 Sets up SQLAlchemy engine, session, and base class for models.
 """
 
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
+# QueuePool sizing for server databases. SQLite gets SQLAlchemy's default
+# pool, which for in-memory URLs (SingletonThreadPool) rejects these
+_pool_options = {} if make_url(settings.DATABASE_URL).get_backend_name() == "sqlite" else {
+    "pool_size": settings.DB_POOL_SIZE,  # Warm connections kept open
+    "max_overflow": settings.DB_MAX_OVERFLOW,  # Extra connections under burst load
+    "pool_timeout": settings.DB_POOL_TIMEOUT,  # Seconds to wait for a free connection
+}
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
+    **_pool_options,
+    pool_recycle=settings.DB_POOL_RECYCLE,  # Replace connections before server-side idle timeouts
     pool_pre_ping=True,  # Verify connections before using them
     echo=settings.DEBUG,  # Log SQL queries in debug mode
 )
@@ -39,9 +51,29 @@ def get_db():
         db.close()
 
 
-def init_db():
+def init_db(connection: Optional[Connection] = None):
     """
     Initialize database by creating all tables.
     Call this function at application startup.
+    
+    Args:
+        connection: Connection to use (the caller commits); by default a
+            pooled connection is checked out and committed here
     """
-    Base.metadata.create_all(bind=engine)
+    from . import models  # noqa: F401 -- registers the tables on Base.metadata
+    
+    if connection is None:
+        with engine.begin() as connection:
+            init_db(connection)
+        return
+    
+    # Spatial columns and indexes need PostGIS (or cube + earthdistance);
+    # the "bbox" backend needs no extensions
+    if connection.dialect.name == "postgresql":
+        if settings.SPATIAL_BACKEND == "postgis":
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+        elif settings.SPATIAL_BACKEND == "earthdistance":
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS cube"))
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS earthdistance"))
+    
+    Base.metadata.create_all(bind=connection)
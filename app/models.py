@@ -3,10 +3,12 @@ SQLAlchemy ORM models for the Flood Forecaster application.
 Defines the database schema for flood events and future user management.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, Enum as SQLEnum, Index, cast
 from sqlalchemy.sql import func
+from geoalchemy2 import Geography, Geometry
 from datetime import datetime
 import enum
+from .config import settings
 from .database import Base
 
 
@@ -16,6 +18,18 @@ class SeverityLevel(str, enum.Enum):
     MEDIUM = "Medium"
     HIGH = "High"
     CRITICAL = "Critical"
+    PENDING = "Pending"  # Risk calculation not finished yet
+    FAILED = "Failed"  # Risk calculation raised; see application logs
+
+
+# Numeric severity levels so severity comparisons can run in SQL
+SEVERITY_LEVELS = {"Low": 0, "Medium": 1, "High": 2, "Critical": 3}
+
+# Spatial columns and indexes depend on the configured backend
+USE_POSTGIS = settings.SPATIAL_BACKEND == "postgis"
+
+# Geography type used when casting point columns for metre-based distance queries
+GEOGRAPHY_POINT = Geography("POINT", srid=4326)
 
 
 class FloodEvent(Base):
@@ -28,11 +42,14 @@ class FloodEvent(Base):
         latitude: Geographic latitude coordinate
         longitude: Geographic longitude coordinate
         severity: Risk level (Low, Medium, High, Critical)
+        severity_level: Numeric form of severity (0-3, NULL while pending) for SQL comparison
         risk_score: Numerical risk score (0-100)
         timestamp: When the event was recorded/predicted
         rainfall_mm: Rainfall amount in millimeters
         elevation_m: Elevation above sea level in meters
         description: Optional additional details
+        updated_at: Last modification time (used for HTTP ETags)
+        location: PostGIS point (SRID 4326) built from longitude/latitude
     """
     __tablename__ = "flood_events"
     
@@ -41,14 +58,26 @@ class FloodEvent(Base):
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     severity = Column(SQLEnum(SeverityLevel), nullable=False)
+    severity_level = Column(SmallInteger, nullable=True)  # See SEVERITY_LEVELS
     risk_score = Column(Float, nullable=False)  # 0-100 scale
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True
+    )
     
     # Additional weather and terrain data
     rainfall_mm = Column(Float, nullable=True)  # Rainfall in mm
     elevation_m = Column(Float, nullable=True)  # Elevation in meters
     description = Column(String, nullable=True)
     
+    if USE_POSTGIS:
+        # Spatial point for PostGIS distance queries (populated from lat/lon on insert)
+        location = Column(Geometry("POINT", srid=4326, spatial_index=False), nullable=True)
+    
     def __repr__(self):
         return f"<FloodEvent(id={self.id}, location='{self.location_name}', severity={self.severity}, score={self.risk_score})>"
 
@@ -93,8 +122,11 @@ class AlertSubscription(Base):
         longitude: Location longitude to monitor
         radius_km: Alert radius in kilometers
         min_severity: Minimum severity to trigger alert (Low/Medium/High/Critical)
+        min_severity_level: Numeric form of min_severity (0-3) for SQL comparison
+        location: PostGIS geography point (SRID 4326) built from longitude/latitude
         is_active: Whether subscription is active
         created_at: Subscription creation timestamp
+        updated_at: Last modification time (used for HTTP ETags)
     """
     __tablename__ = "alert_subscriptions"
     
@@ -105,9 +137,64 @@ class AlertSubscription(Base):
     longitude = Column(Float, nullable=False)
     radius_km = Column(Float, default=5.0)  # Alert radius
     min_severity = Column(String, default="Medium")  # Low, Medium, High, Critical
+    min_severity_level = Column(SmallInteger, default=1, nullable=False, index=True)  # See SEVERITY_LEVELS
+    if USE_POSTGIS:
+        # Stored as geography so ST_DWithin works in metres directly on the indexed column
+        location = Column(Geography("POINT", srid=4326, spatial_index=False), nullable=True)
     is_active = Column(Integer, default=1)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
     
     def __repr__(self):
         return f"<AlertSubscription(id={self.id}, email='{self.email}', location=({self.latitude}, {self.longitude}))>"
 
+
+# Serves crud.get_flood_events (WHERE severity = ? ORDER BY timestamp DESC LIMIT ?)
+# straight from the index with no sort; INCLUDE covers the listed columns
+Index(
+    "ix_flood_events_sev_ts",
+    FloodEvent.severity,
+    FloodEvent.timestamp.desc(),
+    postgresql_include=[
+        "id", "location_name", "latitude", "longitude",
+        "risk_score", "rainfall_mm", "elevation_m",
+    ],
+)
+
+
+if USE_POSTGIS:
+    # SP-GiST index on the geography cast for point lookups in
+    # crud.get_flood_events_by_location (smaller than GiST for point data)
+    Index(
+        "flood_events_loc_spgist",
+        cast(FloodEvent.location, GEOGRAPHY_POINT),
+        postgresql_using="spgist",
+    )
+
+    # GiST index for ST_DWithin in crud.get_subscriptions_near_location
+    Index(
+        "subs_geo_idx",
+        AlertSubscription.location,
+        postgresql_using="gist",
+    )
+elif settings.SPATIAL_BACKEND == "earthdistance":
+    # earthdistance backend: GiST indexes on ll_to_earth(latitude, longitude)
+    Index(
+        "ix_flood_events_earth",
+        func.ll_to_earth(FloodEvent.latitude, FloodEvent.longitude),
+        postgresql_using="gist",
+    )
+    Index(
+        "ix_subs_earth",
+        func.ll_to_earth(AlertSubscription.latitude, AlertSubscription.longitude),
+        postgresql_using="gist",
+    )
+else:
+    # bbox backend: B-tree indexes for the latitude/longitude range prefilter
+    Index("ix_flood_events_lat_lon", FloodEvent.latitude, FloodEvent.longitude)
+    Index("ix_subs_lat_lon", AlertSubscription.latitude, AlertSubscription.longitude)
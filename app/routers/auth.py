@@ -3,6 +3,10 @@ Authentication and user management router (optional).
 Provides endpoints for user registration, login, and JWT token management.
 """
 
+import asyncio
+import time
+from hashlib import blake2b
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
@@ -13,7 +17,7 @@ from ..utils.auth import (
     verify_password,
     get_password_hash,
     create_access_token,
-    decode_access_token
+    get_token_payload
 )
 from ..config import settings
 
@@ -25,6 +29,16 @@ router = APIRouter(
 # OAuth2 password bearer for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Recently verified tokens: token digest -> (user_id, token expiry as unix time)
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def _token_key(token: str) -> bytes:
+    """Keyed digest of a token, so raw tokens are never kept in memory."""
+    return blake2b(
+        token.encode(), digest_size=16, key=settings.SECRET_KEY.encode()[:64]
+    ).digest()
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -32,6 +46,8 @@ async def get_current_user(
 ):
     """
     Dependency to get the current authenticated user from JWT token.
+    Verified tokens are cached briefly so repeat requests skip JWT
+    decoding and the username lookup (the user is re-read by primary key).
     
     Args:
         token: JWT token from Authorization header
@@ -49,7 +65,17 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    username = decode_access_token(token)
+    key = _token_key(token)
+    cached = _token_cache.get(key)
+    if cached is not None and cached[1] > time.time():
+        user = crud.get_user(db, user_id=cached[0])
+        if user is None:
+            _token_cache.pop(key, None)
+            raise credentials_exception
+        return user
+    
+    payload = get_token_payload(token)
+    username = payload.get("sub") if payload else None
     if username is None:
         raise credentials_exception
     
@@ -57,6 +83,7 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
     
+    _token_cache[key] = (user.id, payload.get("exp", 0))
     return user
 
 
@@ -99,8 +126,8 @@ async def register_user(
             detail="Username already taken"
         )
     
-    # Hash password and create user
-    hashed_password = get_password_hash(user.password)
+    # Hash password (bcrypt is CPU-bound, keep it off the event loop) and create user
+    hashed_password = await asyncio.to_thread(get_password_hash, user.password)
     created_user = crud.create_user(db, user=user, hashed_password=hashed_password)
     
     return created_user
@@ -135,9 +162,12 @@ async def login(
     **Errors:**
     - 401: Invalid username or password
     """
-    # Authenticate user
+    # Authenticate user (bcrypt verify runs in a worker thread)
     user = crud.get_user_by_username(db, username=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    password_ok = user is not None and await asyncio.to_thread(
+        verify_password, form_data.password, user.hashed_password
+    )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -1,12 +1,18 @@
+from functools import lru_cache
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-import google.generativeai as genai
 from app.config import settings
 
 router = APIRouter()
 
-# Configure Gemini API
-genai.configure(api_key=settings.GEMINI_API_KEY)
+
+@lru_cache(maxsize=1)
+def get_genai():
+    """Import and configure the Gemini SDK on first use (it adds ~0.5s to startup)."""
+    import google.generativeai as genai
+    genai.configure(api_key=settings.GEMINI_API_KEY)
+    return genai
+
 
 class ChatRequest(BaseModel):
     message: str
@@ -24,7 +30,7 @@ async def chat(request: ChatRequest):
             raise HTTPException(status_code=400, detail="Message cannot be empty")
         
         # Initialize Gemini model
-        model = genai.GenerativeModel('gemini-pro')
+        model = get_genai().GenerativeModel('gemini-pro')
         
         # Add context about FloodAura to make responses more relevant
         context = """You are a helpful assistant for FloodAura, a flood monitoring and alert system. 
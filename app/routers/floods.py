@@ -3,22 +3,50 @@ Flood events API router.
 Provides endpoints for creating and retrieving flood predictions.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import logging
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
+from functools import lru_cache
 from typing import List, Optional
 from .. import crud, schemas
-from ..database import get_db
-from ..services.flood_risk import flood_risk_service
-from ..services.notification import notification_service
+from ..database import SessionLocal, get_db
+from ..utils.http_cache import body_etag, content_etag, is_not_modified, not_modified_response
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/floods",
     tags=["floods"]
 )
 
+# Flood events change slowly relative to reads; let clients reuse responses briefly
+FLOOD_CACHE_CONTROL = "public, max-age=30"
+
+_FLOOD_EVENT_LIST = TypeAdapter(List[schemas.FloodEventResponse])
+
+
+# Services are imported on first use to keep them (and httpx/smtplib)
+# off the import path at startup
+
+@lru_cache(maxsize=None)
+def _risk():
+    """Return the flood risk service singleton."""
+    from ..services.flood_risk import flood_risk_service
+    return flood_risk_service
+
+
+@lru_cache(maxsize=None)
+def _notifier():
+    """Return the notification service singleton."""
+    from ..services.notification import notification_service
+    return notification_service
+
 
 @router.get("/", response_model=List[schemas.FloodEventResponse])
 async def get_flood_events(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records to return"),
     severity: Optional[str] = Query(None, description="Filter by severity (Low, Medium, High, Critical)"),
@@ -34,6 +62,8 @@ async def get_flood_events(
     
     **Returns:**
     List of flood events ordered by most recent first.
+    Sends an `ETag` (a hash of the page); repeat requests with `If-None-Match`
+    get `304 Not Modified` while the page is unchanged.
     
     **Example Response:**
     ```json
@@ -53,13 +83,29 @@ async def get_flood_events(
     ]
     ```
     """
+    # Hashing the serialized page (rather than a max(updated_at) fingerprint)
+    # catches edits within the database's timestamp resolution; the page is
+    # serialized once and sent as-is
     flood_events = crud.get_flood_events(db, skip=skip, limit=limit, severity=severity)
-    return flood_events
+    payload = _FLOOD_EVENT_LIST.dump_json(
+        _FLOOD_EVENT_LIST.validate_python(flood_events, from_attributes=True)
+    )
+    etag = body_etag(payload)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, FLOOD_CACHE_CONTROL)
+    
+    return Response(
+        payload,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": FLOOD_CACHE_CONTROL}
+    )
 
 
 @router.get("/{flood_id}", response_model=schemas.FloodEventResponse)
 async def get_flood_event(
     flood_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
@@ -69,7 +115,7 @@ async def get_flood_event(
     - flood_id: ID of the flood event
     
     **Returns:**
-    Single flood event details.
+    Single flood event details (with `ETag`; `304 Not Modified` on match).
     
     **Errors:**
     - 404: Flood event not found
@@ -77,16 +123,25 @@ async def get_flood_event(
     flood_event = crud.get_flood_event(db, flood_id)
     if flood_event is None:
         raise HTTPException(status_code=404, detail="Flood event not found")
-    return flood_event
+    
+    body = schemas.FloodEventResponse.model_validate(flood_event)
+    etag = content_etag(body)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, FLOOD_CACHE_CONTROL)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = FLOOD_CACHE_CONTROL
+    return body
 
 
-@router.post("/", response_model=schemas.FloodEventResponse, status_code=201)
+@router.post("/", response_model=schemas.FloodEventResponse, status_code=202)
 async def create_flood_event(
     flood_event: schemas.FloodEventCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
-    Create a new flood event with automatic risk calculation.
+    Create a new flood event; risk is calculated in the background.
     
     **Request Body:**
     ```json
@@ -101,14 +156,17 @@ async def create_flood_event(
     ```
     
     **Process:**
-    1. Fetches real-time rainfall data from OpenWeatherMap
-    2. Fetches elevation data from Google Elevation API (or uses mock data)
-    3. Calculates risk score (0-100) based on rainfall and elevation
-    4. Determines severity level (Low/Medium/High/Critical)
-    5. Stores event in database
+    1. Stores the event with severity "Pending" and returns immediately (202)
+    2. In the background, fetches rainfall (OpenWeatherMap) and elevation
+       (Google Elevation API or mock data)
+    3. Calculates risk score (0-100) and severity (Low/Medium/High/Critical)
+       and updates the stored event
+    4. For High/Critical events, notifies nearby subscribers
+    
+    Poll `GET /floods/{id}/status` until `status` is `"complete"` (or `"failed"`).
     
     **Returns:**
-    Created flood event with calculated risk data.
+    The pending flood event, including its ID.
     
     **Example Response:**
     ```json
@@ -117,58 +175,147 @@ async def create_flood_event(
         "location_name": "Main Street, Downtown",
         "latitude": 40.7128,
         "longitude": -74.0060,
-        "severity": "High",
-        "risk_score": 67.5,
+        "severity": "Pending",
+        "risk_score": 0,
         "timestamp": "2025-10-08T10:30:00Z",
-        "rainfall_mm": 35.2,
-        "elevation_m": 15.5,
+        "rainfall_mm": null,
+        "elevation_m": null,
         "description": "Intersection near river"
     }
     ```
     """
-    # Calculate flood risk using the service
-    risk_data = await flood_risk_service.calculate_flood_risk(
-        latitude=flood_event.latitude,
-        longitude=flood_event.longitude,
-        rainfall_override=flood_event.rainfall_mm,
-        elevation_override=flood_event.elevation_m
-    )
-    
-    # Create flood event in database
+    # Store a placeholder row; the real risk data is filled in by _finalize_risk
     db_flood_event = crud.create_flood_event(
         db=db,
         flood_event=flood_event,
-        risk_score=risk_data["risk_score"],
-        severity=risk_data["severity"],
-        rainfall_mm=risk_data["rainfall_mm"],
-        elevation_m=risk_data["elevation_m"]
+        risk_score=0,
+        severity=schemas.SeverityLevel.PENDING.value,
+        rainfall_mm=flood_event.rainfall_mm,
+        elevation_m=flood_event.elevation_m
     )
     
-    # Auto-send notifications if severity is High or Critical
-    if risk_data["severity"] in ["High", "Critical"]:
-        subscriptions = crud.get_subscriptions_near_location(
+    background_tasks.add_task(_finalize_risk, db_flood_event.id, flood_event)
+    
+    return db_flood_event
+
+
+async def _finalize_risk(flood_id: int, flood_event: schemas.FloodEventCreate):
+    """
+    Background task: calculate risk for a pending flood event, store it,
+    and alert nearby subscribers for High/Critical events. If the risk
+    cannot be calculated or stored, the event is marked Failed so its
+    status endpoint reports it instead of staying pending forever.
+    """
+    try:
+        # Calculate flood risk using the service
+        risk_data = await _risk().calculate_flood_risk(
+            latitude=flood_event.latitude,
+            longitude=flood_event.longitude,
+            rainfall_override=flood_event.rainfall_mm,
+            elevation_override=flood_event.elevation_m
+        )
+        # Blocking DB work runs in a worker thread to keep the event loop free
+        subscriptions = await asyncio.to_thread(_store_risk, flood_id, flood_event, risk_data)
+    except Exception:
+        logger.exception("Risk calculation for flood event %s failed", flood_id)
+        try:
+            await asyncio.to_thread(_mark_failed, flood_id)
+        except Exception:
+            logger.exception("Could not mark flood event %s as failed", flood_id)
+        return
+    
+    if subscriptions:
+        emails = []
+        phones = []
+        for sub in subscriptions:
+            if sub.email:
+                emails.append(sub.email)
+            if sub.phone:
+                phones.append(sub.phone)
+        
+        await _notifier().send_flood_alert(
+            location_name=flood_event.location_name,
+            risk_level=risk_data["severity"],
+            risk_score=risk_data["risk_score"],
+            latitude=flood_event.latitude,
+            longitude=flood_event.longitude,
+            phone_numbers=phones if phones else None,
+            emails=emails if emails else None
+        )
+
+
+def _store_risk(flood_id: int, flood_event: schemas.FloodEventCreate, risk_data: dict) -> list:
+    """
+    Store calculated risk on the pending event and return the subscribers
+    to alert (none unless High/Critical). Uses its own session since the
+    request's session is closed by now.
+    """
+    db = SessionLocal()
+    try:
+        updated = crud.update_flood_event_risk(
+            db,
+            flood_id,
+            risk_score=risk_data["risk_score"],
+            severity=risk_data["severity"],
+            rainfall_mm=risk_data["rainfall_mm"],
+            elevation_m=risk_data["elevation_m"]
+        )
+        
+        # Auto-send notifications if severity is High or Critical
+        if updated is None or risk_data["severity"] not in ["High", "Critical"]:
+            return []
+        
+        return crud.get_cached_subscriptions_near_location(
             db,
             latitude=flood_event.latitude,
             longitude=flood_event.longitude,
             min_severity=risk_data["severity"]
         )
-        
-        if subscriptions:
-            emails = [sub.email for sub in subscriptions if sub.email]
-            phones = [sub.phone for sub in subscriptions if sub.phone]
-            
-            # Send notifications asynchronously
-            await notification_service.send_flood_alert(
-                location_name=flood_event.location_name,
-                risk_level=risk_data["severity"],
-                risk_score=risk_data["risk_score"],
-                latitude=flood_event.latitude,
-                longitude=flood_event.longitude,
-                phone_numbers=phones if phones else None,
-                emails=emails if emails else None
-            )
+    finally:
+        db.close()
+
+
+def _mark_failed(flood_id: int):
+    """Mark a pending event Failed in its own session."""
+    db = SessionLocal()
+    try:
+        crud.mark_flood_event_failed(db, flood_id)
+    finally:
+        db.close()
+
+
+@router.get("/{flood_id}/status", response_model=schemas.FloodEventStatus)
+async def get_flood_event_status(
+    flood_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the risk calculation status of a flood event.
     
-    return db_flood_event
+    **Returns:**
+    `status` is `"pending"` while the risk is being calculated,
+    `"complete"` once severity and risk score are available, and
+    `"failed"` if the calculation could not finish.
+    
+    **Errors:**
+    - 404: Flood event not found
+    """
+    flood_event = crud.get_flood_event(db, flood_id)
+    if flood_event is None:
+        raise HTTPException(status_code=404, detail="Flood event not found")
+    
+    if flood_event.severity == schemas.SeverityLevel.PENDING:
+        status = "pending"
+    elif flood_event.severity == schemas.SeverityLevel.FAILED:
+        status = "failed"
+    else:
+        status = "complete"
+    return schemas.FloodEventStatus(
+        id=flood_event.id,
+        status=status,
+        severity=flood_event.severity,
+        risk_score=flood_event.risk_score
+    )
 
 
 @router.get("/nearby/", response_model=List[schemas.FloodEventResponse])
@@ -189,8 +336,7 @@ async def get_nearby_flood_events(
     **Returns:**
     List of flood events within the specified radius.
     
-    **Note:** This uses a simplified bounding box search. For production,
-    consider using PostGIS for accurate geographic queries.
+    **Note:** Distances are great-circle distances computed by PostGIS.
     """
     flood_events = crud.get_flood_events_by_location(
         db=db,
@@ -239,7 +385,7 @@ async def calculate_flood_risk(
     ```
     """
     # Calculate risk without saving
-    risk_data = await flood_risk_service.calculate_flood_risk(
+    risk_data = await _risk().calculate_flood_risk(
         latitude=request.latitude,
         longitude=request.longitude
     )
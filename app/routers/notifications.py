@@ -3,13 +3,23 @@ Notifications API router.
 Provides endpoints for managing alert subscriptions and sending notifications.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Iterator, List, Optional
 from .. import crud, schemas
-from ..database import get_db
-from ..services.notification import notification_service
+from ..database import SessionLocal, get_db
+from ..services.notification import NotificationService, get_notification_service
+from ..services.templates import SUBSCRIPTION_CONFIRMATION_SUBJECT, render_subscription_confirmation
+from ..utils.http_cache import content_etag, is_not_modified, not_modified_response
 
+# Subscriptions hold contact details: only the client may cache them
+SUBSCRIPTION_CACHE_CONTROL = "private, max-age=30"
+
+# Keeps FastAPI's default response class on purpose: for routes with a
+# response_model it dumps JSON bytes straight from pydantic-core, which is
+# faster than ORJSONResponse (a custom class disables that path)
 router = APIRouter(
     prefix="/notifications",
     tags=["notifications"]
@@ -17,9 +27,11 @@ router = APIRouter(
 
 
 @router.post("/subscribe", response_model=schemas.AlertSubscriptionResponse, status_code=201)
-async def subscribe_to_alerts(
+def subscribe_to_alerts(
     subscription: schemas.AlertSubscriptionCreate,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    notifier: NotificationService = Depends(get_notification_service)
 ):
     """
     Subscribe to flood alerts for a specific location.
@@ -51,34 +63,31 @@ async def subscribe_to_alerts(
     # Create subscription
     db_subscription = crud.create_subscription(db, subscription)
     
-    # Send confirmation notification
+    # Queue the confirmation for the notification worker after the response
+    # (falls back to sending from this process when no queue is configured)
     if subscription.email:
-        notification_service.send_email(
+        body, html_body = render_subscription_confirmation(subscription)
+        background_tasks.add_task(
+            notifier.queue_email,
             to_email=subscription.email,
-            subject="🌊 Flood Alert Subscription Confirmed",
-            body=f"You're now subscribed to flood alerts for location ({subscription.latitude}, {subscription.longitude}) within {subscription.radius_km}km radius.",
-            html_body=f"""
-            <h2>🌊 Subscription Confirmed</h2>
-            <p>You're now subscribed to flood alerts for:</p>
-            <ul>
-                <li><strong>Location:</strong> {subscription.latitude}, {subscription.longitude}</li>
-                <li><strong>Radius:</strong> {subscription.radius_km} km</li>
-                <li><strong>Minimum Severity:</strong> {subscription.min_severity}</li>
-            </ul>
-            <p>You'll receive alerts via email when floods are detected in your area.</p>
-            """
+            subject=SUBSCRIPTION_CONFIRMATION_SUBJECT,
+            body=body,
+            html_body=html_body
         )
     
     return db_subscription
 
 
-@router.get("/subscriptions", response_model=List[schemas.AlertSubscriptionResponse])
-async def get_subscriptions(
+@router.get(
+    "/subscriptions",
+    response_model=None,
+    responses={200: {"model": List[schemas.AlertSubscriptionResponse]}}
+)
+def get_subscriptions(
     skip: int = 0,
     limit: int = 100,
-    active_only: bool = True,
-    db: Session = Depends(get_db)
-):
+    active_only: bool = True
+) -> StreamingResponse:
     """
     Get list of alert subscriptions.
     
@@ -86,25 +95,82 @@ async def get_subscriptions(
     - skip: Pagination offset
     - limit: Maximum results
     - active_only: Show only active subscriptions
+    
+    **Returns:**
+    JSON array streamed row by row, so large pages are never held in memory.
+    """
+    # The query runs and the first row is serialized before streaming
+    # starts, so those failures are still a 500 rather than a truncated 200.
+    # The session outlives this function: the rest of the body is produced
+    # while the response is sent, after request-scoped dependencies close
+    db = SessionLocal()
+    try:
+        subscriptions = iter(
+            crud.get_subscriptions(db, skip=skip, limit=limit, active_only=active_only)
+        )
+        first = next(subscriptions, None)
+        first_item = None if first is None else _subscription_json(first)
+    except BaseException:
+        db.close()
+        raise
+    
+    return StreamingResponse(
+        _stream_subscriptions(db, first_item, subscriptions),
+        media_type="application/json"
+    )
+
+
+def _subscription_json(subscription) -> str:
+    """Serialize one subscription exactly as AlertSubscriptionResponse."""
+    return schemas.AlertSubscriptionResponse.model_validate(subscription).model_dump_json()
+
+
+def _stream_subscriptions(db: Session, first_item: Optional[str], subscriptions: Iterator) -> Iterator[str]:
     """
-    subscriptions = crud.get_subscriptions(db, skip=skip, limit=limit, active_only=active_only)
-    return subscriptions
+    Yield a JSON array of subscriptions one element at a time, starting with
+    the already-serialized first element, then close the session.
+    """
+    try:
+        if first_item is None:
+            yield "[]"
+            return
+        yield f"[{first_item}"
+        for subscription in subscriptions:
+            yield f",{_subscription_json(subscription)}"
+        yield "]"
+    finally:
+        db.close()
 
 
 @router.get("/subscriptions/{subscription_id}", response_model=schemas.AlertSubscriptionResponse)
-async def get_subscription(
+def get_subscription(
     subscription_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """Get specific subscription by ID."""
+    """
+    Get specific subscription by ID.
+    
+    **Returns:**
+    Subscription details (with `ETag`; `304 Not Modified` on match).
+    """
     subscription = crud.get_subscription(db, subscription_id)
     if not subscription:
         raise HTTPException(status_code=404, detail="Subscription not found")
-    return subscription
+    
+    body = schemas.AlertSubscriptionResponse.model_validate(subscription)
+    etag = content_etag(body)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, SUBSCRIPTION_CACHE_CONTROL)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = SUBSCRIPTION_CACHE_CONTROL
+    return body
 
 
 @router.put("/subscriptions/{subscription_id}", response_model=schemas.AlertSubscriptionResponse)
-async def update_subscription(
+def update_subscription(
     subscription_id: int,
     subscription_update: schemas.AlertSubscriptionUpdate,
     db: Session = Depends(get_db)
@@ -129,7 +195,7 @@ async def update_subscription(
 
 
 @router.delete("/subscriptions/{subscription_id}", response_model=schemas.MessageResponse)
-async def delete_subscription(
+def delete_subscription(
     subscription_id: int,
     db: Session = Depends(get_db)
 ):
@@ -145,7 +211,10 @@ async def delete_subscription(
 
 
 @router.post("/test", response_model=dict)
-async def test_notifications(test: schemas.NotificationTest):
+async def test_notifications(
+    test: schemas.NotificationTest,
+    notifier: NotificationService = Depends(get_notification_service)
+):
     """
     Test notification system.
     
@@ -166,7 +235,7 @@ async def test_notifications(test: schemas.NotificationTest):
             detail="Provide at least one contact method to test"
         )
     
-    results = await notification_service.send_test_notification(
+    results = await notifier.send_test_notification(
         phone=test.phone,
         email=test.email
     )
@@ -180,7 +249,8 @@ async def test_notifications(test: schemas.NotificationTest):
 @router.post("/send-alert", response_model=schemas.NotificationResult)
 async def send_alert_notifications(
     flood_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    notifier: NotificationService = Depends(get_notification_service)
 ):
     """
     Send notifications for a specific flood event to subscribed users.
@@ -191,17 +261,24 @@ async def send_alert_notifications(
     **Returns:**
     Notification results (emails and SMS sent/failed)
     """
-    # Get flood event
-    flood_event = crud.get_flood_event(db, flood_id)
+    # Blocking DB calls run in a worker thread to keep the event loop free
+    flood_event = await asyncio.to_thread(crud.get_flood_event, db, flood_id)
     if not flood_event:
         raise HTTPException(status_code=404, detail="Flood event not found")
+    if flood_event.severity_level is None:
+        # Risk is still being calculated (or failed): no severity to match on
+        raise HTTPException(
+            status_code=409,
+            detail="Flood event has no calculated risk yet; alerts can only be sent once it does"
+        )
     
     # Get subscriptions near this location
-    subscriptions = crud.get_subscriptions_near_location(
+    subscriptions = await asyncio.to_thread(
+        crud.get_cached_subscriptions_near_location,
         db,
         latitude=flood_event.latitude,
         longitude=flood_event.longitude,
-        min_severity=flood_event.severity
+        min_severity=flood_event.severity_level
     )
     
     if not subscriptions:
@@ -214,7 +291,7 @@ async def send_alert_notifications(
     phones = [sub.phone for sub in subscriptions if sub.phone]
     
     # Send notifications
-    results = await notification_service.send_flood_alert(
+    results = await notifier.send_flood_alert(
         location_name=flood_event.location_name,
         risk_level=flood_event.severity,
         risk_score=flood_event.risk_score,
@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation.
 Defines the data structures for API input and output.
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional
 from enum import Enum
@@ -15,6 +15,8 @@ class SeverityLevel(str, Enum):
     MEDIUM = "Medium"
     HIGH = "High"
     CRITICAL = "Critical"
+    PENDING = "Pending"  # Risk calculation not finished yet
+    FAILED = "Failed"  # Risk calculation raised; see application logs
 
 
 # Flood Event Schemas
@@ -49,8 +51,15 @@ class FloodEventResponse(FloodEventBase):
     rainfall_mm: Optional[float]
     elevation_m: Optional[float]
     
-    class Config:
-        from_attributes = True  # Enables ORM mode for SQLAlchemy models
+    model_config = ConfigDict(from_attributes=True)  # Enables ORM mode for SQLAlchemy models
+
+
+class FloodEventStatus(BaseModel):
+    """Schema for the risk calculation status of a flood event."""
+    id: int
+    status: str = Field(..., description="pending, failed or complete")
+    severity: SeverityLevel
+    risk_score: float
 
 
 class FloodEventUpdate(BaseModel):
@@ -100,8 +109,7 @@ class UserResponse(UserBase):
     is_admin: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -148,9 +156,15 @@ class AlertSubscriptionBase(BaseModel):
     min_severity: str = Field("Medium", description="Minimum severity (Low/Medium/High/Critical)")
 
 
+# Severity names a subscription threshold can use (no "Pending")
+SEVERITY_NAME_PATTERN = "^(Low|Medium|High|Critical)$"
+
+
 class AlertSubscriptionCreate(AlertSubscriptionBase):
     """Schema for creating alert subscription."""
-    pass
+    min_severity: str = Field(
+        "Medium", pattern=SEVERITY_NAME_PATTERN, description="Minimum severity (Low/Medium/High/Critical)"
+    )
 
 
 class AlertSubscriptionResponse(AlertSubscriptionBase):
@@ -159,16 +173,15 @@ class AlertSubscriptionResponse(AlertSubscriptionBase):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AlertSubscriptionUpdate(BaseModel):
     """Schema for updating alert subscription."""
     email: Optional[str] = None
     phone: Optional[str] = None
-    radius_km: Optional[float] = None
-    min_severity: Optional[str] = None
+    radius_km: Optional[float] = Field(None, ge=0.1, le=50)
+    min_severity: Optional[str] = Field(None, pattern=SEVERITY_NAME_PATTERN)
     is_active: Optional[bool] = None
 
 
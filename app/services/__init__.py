@@ -1,5 +1,5 @@
 """Services package initialization."""
 from .flood_risk import flood_risk_service, FloodRiskService
-from .notification import notification_service, NotificationService
+from .notification import notification_service, get_notification_service, NotificationService
 
-__all__ = ["flood_risk_service", "FloodRiskService", "notification_service", "NotificationService"]
+__all__ = ["flood_risk_service", "FloodRiskService", "notification_service", "get_notification_service", "NotificationService"]
@@ -3,10 +3,31 @@ Flood risk calculation service.
 Integrates with OpenWeatherMap API and Google Elevation API to calculate flood risk scores.
 """
 
+import asyncio
+import struct
+import zlib
+from bisect import bisect_left, bisect_right
 import httpx
-from typing import Tuple, Optional, Dict
+from cachetools import TTLCache
+from typing import Dict, List, Optional, Sequence, Tuple
 from ..config import settings
-from ..schemas import SeverityLevel
+
+
+# Cache keys round coordinates to 3 decimals (~110 m): nearby lookups share
+# one upstream call. Rainfall changes quickly, elevation effectively never.
+COORD_CACHE_PRECISION = 3
+RAINFALL_CACHE_TTL = 60  # seconds
+ELEVATION_CACHE_TTL = 24 * 60 * 60
+
+# Risk score lookup tables (see FloodRiskService.calculate_risk_score):
+# a value below THRESHOLDS[i] (and not below the previous one) scores SCORES[i]
+RAINFALL_THRESHOLDS = (5, 15, 30, 50)
+RAINFALL_SCORES = (10, 20, 35, 50, 60)
+ELEVATION_THRESHOLDS = (10, 50, 100, 200)
+ELEVATION_SCORES = (40, 30, 20, 10, 5)
+# Upper bounds (inclusive) of the Low/Medium/High score bands; above is Critical
+SEVERITY_THRESHOLDS = (25, 50, 75)
+SEVERITIES = ("Low", "Medium", "High", "Critical")
 
 
 class FloodRiskService:
@@ -30,18 +51,46 @@ class FloodRiskService:
         self.google_elevation_api_key = settings.GOOGLE_ELEVATION_API_KEY
         self.openweather_base_url = "https://api.openweathermap.org/data/2.5"
         self.google_elevation_base_url = "https://maps.googleapis.com/maps/api/elevation/json"
+        self._client: Optional[httpx.AsyncClient] = None
+        # (rounded lat, rounded lon) -> value; only successful API results are cached
+        self._rainfall_cache: TTLCache = TTLCache(maxsize=10_000, ttl=RAINFALL_CACHE_TTL)
+        self._elevation_cache: TTLCache = TTLCache(maxsize=100_000, ttl=ELEVATION_CACHE_TTL)
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP client, created on first use so it binds to the running
+        event loop. Keeps connections to OpenWeatherMap/Google alive between
+        calls instead of paying a TCP + TLS handshake per request.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client (called on application shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def clear_caches(self):
+        """Drop cached rainfall and elevation lookups (e.g. after an upstream data change)."""
+        self._rainfall_cache.clear()
+        self._elevation_cache.clear()
+    
+    @staticmethod
+    def _cache_key(latitude: float, longitude: float) -> Tuple[float, float]:
+        """Cache key for a coordinate, rounded to COORD_CACHE_PRECISION."""
+        return round(latitude, COORD_CACHE_PRECISION), round(longitude, COORD_CACHE_PRECISION)
     
     @staticmethod
     def calculate_severity(risk_score: float) -> str:
         """Calculate severity from risk score."""
-        if risk_score <= 25:
-            return "Low"
-        elif risk_score <= 50:
-            return "Medium"
-        elif risk_score <= 75:
-            return "High"
-        else:
-            return "Critical"
+        return SEVERITIES[bisect_left(SEVERITY_THRESHOLDS, risk_score)]
     
     async def get_rainfall_data(self, latitude: float, longitude: float) -> float:
         """
@@ -54,31 +103,37 @@ class FloodRiskService:
         Returns:
             Rainfall amount in mm (last hour or current)
         """
+        cache_key = self._cache_key(latitude, longitude)
+        cached = self._rainfall_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            async with httpx.AsyncClient() as client:
-                # Get current weather data
-                url = f"{self.openweather_base_url}/weather"
-                params = {
-                    "lat": latitude,
-                    "lon": longitude,
-                    "appid": self.openweather_api_key,
-                    "units": "metric"
-                }
-                
-                response = await client.get(url, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                
-                # Extract rainfall data (rain in last 1 hour)
-                rainfall = 0.0
-                if "rain" in data:
-                    rainfall = data["rain"].get("1h", 0.0)  # mm in last hour
-                
-                # If no current rain, check forecast for precipitation
-                if rainfall == 0.0:
-                    rainfall = await self._get_forecast_rainfall(latitude, longitude)
-                
-                return rainfall
+            client = self.client
+            # Get current weather data
+            url = f"{self.openweather_base_url}/weather"
+            params = {
+                "lat": latitude,
+                "lon": longitude,
+                "appid": self.openweather_api_key,
+                "units": "metric"
+            }
+            
+            response = await client.get(url, params=params, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            
+            # Extract rainfall data (rain in last 1 hour)
+            rainfall = 0.0
+            if "rain" in data:
+                rainfall = data["rain"].get("1h", 0.0)  # mm in last hour
+            
+            # If no current rain, check forecast for precipitation
+            if rainfall == 0.0:
+                rainfall = await self._get_forecast_rainfall(latitude, longitude)
+            
+            self._rainfall_cache[cache_key] = rainfall
+            return rainfall
         
         except httpx.HTTPError as e:
             print(f"Error fetching rainfall data: {e}")
@@ -100,28 +155,26 @@ class FloodRiskService:
             Predicted rainfall in mm
         """
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{self.openweather_base_url}/forecast"
-                params = {
-                    "lat": latitude,
-                    "lon": longitude,
-                    "appid": self.openweather_api_key,
-                    "units": "metric",
-                    "cnt": 8  # Next 24 hours (3-hour intervals)
-                }
-                
-                response = await client.get(url, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                
-                # Sum up rainfall from next few hours
-                total_rainfall = 0.0
-                if "list" in data:
-                    for forecast in data["list"][:4]:  # Next 12 hours
-                        if "rain" in forecast:
-                            total_rainfall += forecast["rain"].get("3h", 0.0)
-                
-                return total_rainfall / 4 if total_rainfall > 0 else 0.0  # Average per 3 hours
+            client = self.client
+            url = f"{self.openweather_base_url}/forecast"
+            params = {
+                "lat": latitude,
+                "lon": longitude,
+                "appid": self.openweather_api_key,
+                "units": "metric",
+                "cnt": 8  # Next 24 hours (3-hour intervals)
+            }
+            
+            response = await client.get(url, params=params, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            
+            # Sum up rainfall from the next 12 hours (4 x 3-hour intervals)
+            total_rainfall = sum(
+                forecast.get("rain", {}).get("3h", 0.0) for forecast in data.get("list", [])[:4]
+            )
+            
+            return total_rainfall / 4 if total_rainfall > 0 else 0.0  # Average per 3 hours
         
         except Exception as e:
             print(f"Error fetching forecast data: {e}")
@@ -142,26 +195,32 @@ class FloodRiskService:
         if not self.google_elevation_api_key or self.google_elevation_api_key == "your_google_elevation_api_key_here":
             return self._mock_elevation(latitude, longitude)
         
+        cache_key = self._cache_key(latitude, longitude)
+        cached = self._elevation_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "locations": f"{latitude},{longitude}",
-                    "key": self.google_elevation_api_key
-                }
-                
-                response = await client.get(
-                    self.google_elevation_base_url,
-                    params=params,
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get("status") == "OK" and data.get("results"):
-                    elevation = data["results"][0]["elevation"]
-                    return elevation
-                else:
-                    return self._mock_elevation(latitude, longitude)
+            client = self.client
+            params = {
+                "locations": f"{latitude},{longitude}",
+                "key": self.google_elevation_api_key
+            }
+            
+            response = await client.get(
+                self.google_elevation_base_url,
+                params=params,
+                timeout=10.0
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get("status") == "OK" and data.get("results"):
+                elevation = data["results"][0]["elevation"]
+                self._elevation_cache[cache_key] = elevation
+                return elevation
+            else:
+                return self._mock_elevation(latitude, longitude)
         
         except Exception as e:
             print(f"Error fetching elevation data: {e}")
@@ -182,7 +241,9 @@ class FloodRiskService:
         # Simple heuristic: use latitude to vary elevation
         # Coastal areas (near equator) tend to be lower
         base_elevation = abs(latitude) * 10  # 0-900m range
-        variation = (hash(f"{latitude},{longitude}") % 100) - 50  # -50 to +50m
+        # crc32 of the packed floats: no string building, and unlike str hash()
+        # it is stable across processes (PYTHONHASHSEED)
+        variation = (zlib.crc32(struct.pack("<dd", latitude, longitude)) % 100) - 50  # -50 to +50m
         return max(0, base_elevation + variation)
     
     def calculate_risk_score(
@@ -215,45 +276,43 @@ class FloodRiskService:
         Returns:
             Tuple of (risk_score, severity_level)
         """
-        # Calculate rainfall contribution (0-60 points)
-        if rainfall_mm < 5:
-            rainfall_score = 10
-        elif rainfall_mm < 15:
-            rainfall_score = 20
-        elif rainfall_mm < 30:
-            rainfall_score = 35
-        elif rainfall_mm < 50:
-            rainfall_score = 50
-        else:
-            rainfall_score = 60
-        
-        # Calculate elevation contribution (0-40 points)
-        # Lower elevation = higher risk
-        if elevation_m < 10:
-            elevation_score = 40
-        elif elevation_m < 50:
-            elevation_score = 30
-        elif elevation_m < 100:
-            elevation_score = 20
-        elif elevation_m < 200:
-            elevation_score = 10
-        else:
-            elevation_score = 5
+        # Rainfall (0-60 points) and elevation (0-40 points, lower = riskier)
+        # contributions: binary search into the threshold tables
+        rainfall_score = RAINFALL_SCORES[bisect_right(RAINFALL_THRESHOLDS, rainfall_mm)]
+        elevation_score = ELEVATION_SCORES[bisect_right(ELEVATION_THRESHOLDS, elevation_m)]
         
         # Total risk score (0-100)
         total_score = rainfall_score + elevation_score
         
-        # Determine severity level
-        if total_score <= 25:
-            severity = SeverityLevel.LOW
-        elif total_score <= 50:
-            severity = SeverityLevel.MEDIUM
-        elif total_score <= 75:
-            severity = SeverityLevel.HIGH
-        else:
-            severity = SeverityLevel.CRITICAL
+        # Determine severity level (plain string, same values as SeverityLevel)
+        return total_score, SEVERITIES[bisect_left(SEVERITY_THRESHOLDS, total_score)]
+    
+    def calculate_risk_scores_batch(
+        self,
+        rainfall_values: Sequence[float],
+        elevation_values: Sequence[float]
+    ) -> List[Tuple[float, str]]:
+        """
+        Score many locations at once with the same formula as calculate_risk_score.
+        
+        Args:
+            rainfall_values: Rainfall amounts in millimeters
+            elevation_values: Elevations in meters (same length as rainfall_values)
+        
+        Returns:
+            List of (risk_score, severity_level) tuples, in input order
         
-        return total_score, severity.value
+        Raises:
+            ValueError: If the two sequences differ in length
+        """
+        if len(rainfall_values) != len(elevation_values):
+            raise ValueError(
+                f"Got {len(rainfall_values)} rainfall values but {len(elevation_values)} elevations"
+            )
+        return [
+            self.calculate_risk_score(rainfall_mm, elevation_m)
+            for rainfall_mm, elevation_m in zip(rainfall_values, elevation_values)
+        ]
     
     async def calculate_flood_risk(
         self,
@@ -274,9 +333,18 @@ class FloodRiskService:
         Returns:
             Dictionary with risk calculation results
         """
-        # Fetch data from APIs or use overrides
-        rainfall = rainfall_override if rainfall_override is not None else await self.get_rainfall_data(latitude, longitude)
-        elevation = elevation_override if elevation_override is not None else await self.get_elevation_data(latitude, longitude)
+        # Fetch data from APIs or use overrides; the two lookups are
+        # independent, so run them concurrently
+        rain_task = (
+            asyncio.create_task(self.get_rainfall_data(latitude, longitude))
+            if rainfall_override is None else None
+        )
+        elev_task = (
+            asyncio.create_task(self.get_elevation_data(latitude, longitude))
+            if elevation_override is None else None
+        )
+        rainfall = rainfall_override if rain_task is None else await rain_task
+        elevation = elevation_override if elev_task is None else await elev_task
         
         # Calculate risk score
         risk_score, severity = self.calculate_risk_score(rainfall, elevation)
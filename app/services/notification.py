@@ -3,13 +3,101 @@ Notification service for sending alerts via email, SMS, and push notifications.
 Integrates with Twilio for SMS and SMTP for email.
 """
 
-import smtplib
+import asyncio
+import logging
+import math
+import random
+import re
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
+from functools import lru_cache
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
 from ..config import settings
+from .smtp_pool import SMTPPool
+from .templates import render_flood_alert
+import aiosmtplib
 import httpx
 
+logger = logging.getLogger(__name__)
+
+
+# Cap on in-flight SMS across all alerts (HTTP/2 streams, or HTTP/1.1
+# connections on fallback), so sends never queue inside httpx
+SMS_MAX_CONNECTIONS = 50
+# Attempts per SMS / email batch on transient failures, with exponential
+# backoff (0.5s, 1s, 2s ... capped) plus up to 1s of jitter between them
+SEND_MAX_ATTEMPTS = 4
+RETRY_INITIAL_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+T = TypeVar("T")
+
+
+class TransientSendError(Exception):
+    """A provider reply that is worth retrying (rate limited or temporarily unavailable)."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether a send failure may succeed if retried without risking a
+    duplicate: Twilio 429/5xx replies, HTTP errors before the request was
+    sent (connect, pool timeout), SMTP connection failures and SMTP 4xx
+    replies (421, 450, 451, 452). A Twilio read timeout is not retried
+    since the SMS may already have gone out.
+    """
+    if isinstance(error, (TransientSendError, httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    if isinstance(error, (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, aiosmtplib.SMTPTimeoutError)):
+        return True
+    return isinstance(error, aiosmtplib.SMTPResponseException) and 400 <= error.code < 500
+
+
+async def _retry_transient(send: Callable[[], Awaitable[T]], description: str) -> T:
+    """
+    Await send(), retrying transient failures with exponential backoff and
+    jitter. Permanent failures, and the last transient one, are re-raised.
+    """
+    for attempt in range(1, SEND_MAX_ATTEMPTS + 1):
+        try:
+            return await send()
+        except Exception as e:
+            if attempt == SEND_MAX_ATTEMPTS or not is_transient(e):
+                raise
+            delay = min(RETRY_MAX_DELAY, RETRY_INITIAL_DELAY * 2 ** (attempt - 1)) + random.uniform(0, 1)
+            logger.warning("%s failed (%s), retrying in %.1fs", description, e, delay)
+            await asyncio.sleep(delay)
+
+
+def _normalize_phone(phone: str) -> str:
+    """
+    Reduce a phone number to its digits, keeping a leading '+'. Used only as
+    a dedup key: extensions and formatting are dropped, so the result is not
+    necessarily a number Twilio can deliver to.
+    """
+    digits = re.sub(r"\D", "", phone)
+    return f"+{digits}" if digits and phone.strip().startswith("+") else digits
+
+
+def _unique_recipients(
+    phone_numbers: Optional[List[str]],
+    emails: Optional[List[str]]
+) -> Tuple[List[str], List[str]]:
+    """
+    Drop duplicate recipients (overlapping subscriptions), preserving order.
+    Phones are compared by their digits and emails case-insensitively; each
+    is sent as first seen, so the provider still validates the original.
+    """
+    unique_phones = {}
+    for phone in phone_numbers or []:
+        key = _normalize_phone(phone)
+        if key:
+            unique_phones.setdefault(key, phone.strip())
+    unique_emails = {}
+    for email in emails or []:
+        unique_emails.setdefault(email.strip().lower(), email.strip())
+    return list(unique_phones.values()), list(unique_emails.values())
+
 
 class NotificationService:
     """Service for sending notifications to users."""
@@ -22,6 +110,88 @@ class NotificationService:
         self.smtp_port = getattr(settings, 'SMTP_PORT', 587)
         self.smtp_email = getattr(settings, 'SMTP_EMAIL', None)
         self.smtp_password = getattr(settings, 'SMTP_PASSWORD', None)
+        self.redis_url = settings.REDIS_URL
+        self._queue = None  # arq connection pool, created on first enqueue
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sms_slots: Optional[asyncio.Semaphore] = None
+        self._smtp_pool = SMTPPool(
+            self.smtp_server, self.smtp_port, self.smtp_email, self.smtp_password,
+            size=settings.SMTP_POOL_SIZE
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP client for Twilio, created on first use so it binds to the
+        running event loop. Reuses keep-alive connections instead of a new
+        TCP + TLS handshake per SMS.
+        
+        With HTTP/2 negotiated, concurrent SMS are multiplexed as streams on
+        one connection; the connection limits only come into play if the
+        server falls back to HTTP/1.1 (one request per connection), so they
+        are kept at the in-flight cap rather than pinned to 1.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=SMS_MAX_CONNECTIONS, max_keepalive_connections=20)
+            )
+        return self._client
+    
+    @property
+    def sms_slots(self) -> asyncio.Semaphore:
+        """
+        Service-wide cap on in-flight Twilio requests, created on first use
+        (like client) so it binds to the running event loop rather than the
+        one current at import.
+        """
+        if self._sms_slots is None:
+            self._sms_slots = asyncio.Semaphore(SMS_MAX_CONNECTIONS)
+        return self._sms_slots
+    
+    @property
+    def email_configured(self) -> bool:
+        """Whether SMTP credentials are set."""
+        return bool(self.smtp_email and self.smtp_password)
+    
+    async def queue_email(self, to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> bool:
+        """
+        Hand an email to the notification worker (worker.py) when REDIS_URL is
+        configured, so SMTP latency and retries stay out of the API process.
+        Without a queue (or if enqueueing fails) the email is sent from here.
+        
+        Returns:
+            True if queued or sent, False otherwise
+        """
+        if self.redis_url:
+            try:
+                queue = await self._get_queue()
+                await queue.enqueue_job("send_email_job", to_email, subject, body, html_body)
+                return True
+            except Exception as e:
+                logger.warning("Email queue unavailable, sending directly: %s", e)
+        
+        return await self.send_email(to_email, subject, body, html_body)
+    
+    async def _get_queue(self):
+        """Connect to the arq queue (arq is only required when REDIS_URL is set)."""
+        if self._queue is None:
+            from arq import create_pool
+            from arq.connections import RedisSettings
+            self._queue = await create_pool(RedisSettings.from_dsn(self.redis_url))
+        return self._queue
+    
+    async def aclose(self):
+        """Close the HTTP client, queue connection and SMTP sessions (called on application shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._sms_slots = None
+        if self._queue is not None:
+            await self._queue.aclose()
+            self._queue = None
+        await self._smtp_pool.close()
     
     async def send_sms(self, to_phone: str, message: str) -> bool:
         """
@@ -35,36 +205,50 @@ class NotificationService:
             True if sent successfully, False otherwise
         """
         if not all([self.twilio_sid, self.twilio_token, self.twilio_phone]):
-            print("⚠️ Twilio credentials not configured. SMS not sent.")
+            logger.warning("Twilio credentials not configured. SMS not sent.")
             return False
         
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_sid}/Messages.json"
-                
-                response = await client.post(
-                    url,
-                    auth=(self.twilio_sid, self.twilio_token),
-                    data={
-                        "From": self.twilio_phone,
-                        "To": to_phone,
-                        "Body": message
-                    },
-                    timeout=10.0
-                )
-                
-                if response.status_code == 201:
-                    print(f"✅ SMS sent to {to_phone}")
-                    return True
-                else:
-                    print(f"❌ SMS failed: {response.text}")
-                    return False
+            response = await _retry_transient(
+                lambda: self._post_sms(to_phone, message), f"SMS to {to_phone}"
+            )
+            
+            if response.status_code == 201:
+                logger.info("SMS sent to %s", to_phone)
+                return True
+            else:
+                logger.error("SMS to %s failed: %s", to_phone, response.text)
+                return False
         
-        except Exception as e:
-            print(f"❌ SMS error: {e}")
+        except Exception:
+            logger.exception("SMS to %s failed", to_phone)
             return False
     
-    def send_email(self, to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> bool:
+    async def _post_sms(self, to_phone: str, message: str) -> httpx.Response:
+        """
+        POST one message to Twilio; 429 and 5xx replies raise TransientSendError.
+        Holds a service-wide slot only for the request itself, so retry
+        backoff never keeps other alerts' SMS waiting.
+        """
+        url = f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_sid}/Messages.json"
+        
+        async with self.sms_slots:
+            response = await self.client.post(
+                url,
+                auth=(self.twilio_sid, self.twilio_token),
+                data={
+                    "From": self.twilio_phone,
+                    "To": to_phone,
+                    "Body": message
+                },
+                timeout=10.0
+            )
+        
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientSendError(f"Twilio returned {response.status_code}")
+        return response
+    
+    async def send_email(self, to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> bool:
         """
         Send email notification via SMTP.
         
@@ -77,36 +261,121 @@ class NotificationService:
         Returns:
             True if sent successfully, False otherwise
         """
-        if not all([self.smtp_email, self.smtp_password]):
-            print("⚠️ SMTP credentials not configured. Email not sent.")
+        if not self.email_configured:
+            logger.warning("SMTP credentials not configured. Email not sent.")
             return False
         
         try:
-            # Create message
+            await self.deliver_email(to_email, subject, body, html_body)
+            return True
+        except Exception:
+            logger.exception("Email to %s failed", to_email)
+            return False
+    
+    async def deliver_email(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        retry: bool = True
+    ):
+        """
+        Send one email on a pooled session, raising on failure.
+        
+        Args:
+            retry: Retry transient failures here; pass False when the caller
+                retries itself (worker.py), so there is one retry layer
+        """
+        msg = self._build_message(to_email, subject, body, html_body)
+        if retry:
+            await _retry_transient(
+                lambda: self._smtp_pool.send_message(msg), f"Email to {to_email}"
+            )
+        else:
+            await self._smtp_pool.send_message(msg)
+        logger.info("Email sent to %s", to_email)
+    
+    def _build_message(self, to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> Message:
+        """
+        Build an email from the configured sender: multipart/alternative when
+        there is an HTML body and RICH_EMAIL_ENABLED, otherwise a single
+        text/plain part (about half the bytes on the wire).
+        """
+        if html_body and settings.RICH_EMAIL_ENABLED:
             msg = MIMEMultipart('alternative')
-            msg['From'] = self.smtp_email
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            # Attach plain text
             msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach HTML if provided
-            if html_body:
-                msg.attach(MIMEText(html_body, 'html'))
-            
-            # Send via SMTP
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_email, self.smtp_password)
-                server.send_message(msg)
-            
-            print(f"✅ Email sent to {to_email}")
-            return True
+            msg.attach(MIMEText(html_body, 'html'))
+        else:
+            msg = MIMEText(body, 'plain')
         
-        except Exception as e:
-            print(f"❌ Email error: {e}")
-            return False
+        msg['From'] = self.smtp_email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        return msg
+    
+    async def _send_email_batch(self, payload: bytes, recipients: List[str]) -> Tuple[int, int]:
+        """
+        Deliver one serialized message to a batch of BCC recipients in a single SMTP transaction.
+        
+        Returns:
+            (sent, failed) recipient counts
+        """
+        try:
+            refused = await _retry_transient(
+                lambda: self._smtp_pool.sendmail(self.smtp_email, recipients, payload),
+                f"Bulk email to {len(recipients)} recipients"
+            )
+        except Exception:
+            logger.exception("Bulk email to %d recipients failed", len(recipients))
+            return 0, len(recipients)
+        
+        logger.info("Email sent to %d recipients", len(recipients) - len(refused))
+        return len(recipients) - len(refused), len(refused)
+    
+    async def send_bulk_email(
+        self,
+        emails: List[str],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """
+        Send the same email to many recipients as BCC batches, one SMTP
+        transaction per batch instead of per address.
+        
+        Args:
+            emails: Recipient email addresses
+            subject: Email subject
+            body: Plain text body
+            html_body: Optional HTML body
+            batch_size: Maximum recipients per message (defaults to SMTP_BCC_BATCH_SIZE)
+        
+        Returns:
+            (sent, failed) recipient counts
+        """
+        if not emails:
+            return 0, 0
+        if not self.email_configured:
+            logger.warning("SMTP credentials not configured. Email not sent.")
+            return 0, len(emails)
+        
+        # Each RCPT TO costs a round trip (no PIPELINING in aiosmtplib), so
+        # spread recipients evenly over every pooled session instead of
+        # filling batches up to the limit one after another
+        batch_size = batch_size or settings.SMTP_BCC_BATCH_SIZE
+        batches = max(math.ceil(len(emails) / batch_size), min(self._smtp_pool.size, len(emails)))
+        batch_size = math.ceil(len(emails) / batches)
+        # Recipients only see the sender's own address in To; the real
+        # addresses go in the envelope, so none of them are disclosed and
+        # the message is MIME-encoded once for every batch
+        payload = self._build_message(self.smtp_email, subject, body, html_body).as_bytes()
+        counts = await asyncio.gather(*(
+            self._send_email_batch(payload, emails[i:i + batch_size])
+            for i in range(0, len(emails), batch_size)
+        ))
+        return sum(sent for sent, _ in counts), sum(failed for _, failed in counts)
     
     async def send_flood_alert(
         self,
@@ -133,88 +402,35 @@ class NotificationService:
         Returns:
             Dictionary with notification results
         """
-        # Create message content
-        sms_message = (
-            f"🌊 FLOOD ALERT: {risk_level} risk at {location_name}\n"
-            f"Risk Score: {risk_score:.1f}/100\n"
-            f"Location: {latitude:.4f}, {longitude:.4f}\n"
-            f"Take necessary precautions."
+        sms_message, email_subject, email_body, email_html = render_flood_alert(
+            location_name, risk_level, risk_score, latitude, longitude
         )
         
-        email_subject = f"🌊 Flood Alert: {risk_level} Risk at {location_name}"
+        phone_numbers, emails = _unique_recipients(phone_numbers, emails)
         
-        email_body = f"""
-Flood Risk Alert
-
-Location: {location_name}
-Risk Level: {risk_level}
-Risk Score: {risk_score:.1f}/100
-Coordinates: {latitude:.4f}, {longitude:.4f}
-
-Please take necessary precautions and stay safe.
-
-This is an automated alert from the Hyperlocal Urban Flood Forecaster.
-"""
-        
-        email_html = f"""
-<html>
-<body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; text-align: center;">
-        <h1 style="color: white; margin: 0;">🌊 Flood Risk Alert</h1>
-    </div>
-    
-    <div style="padding: 20px; background-color: #f8f9fa;">
-        <div style="background: white; padding: 20px; border-radius: 8px; margin-bottom: 20px;">
-            <h2 style="color: {'#dc3545' if risk_level in ['High', 'Critical'] else '#ffc107' if risk_level == 'Medium' else '#28a745'};">
-                {risk_level} Risk Level
-            </h2>
-            <p><strong>Location:</strong> {location_name}</p>
-            <p><strong>Risk Score:</strong> {risk_score:.1f}/100</p>
-            <p><strong>Coordinates:</strong> {latitude:.4f}, {longitude:.4f}</p>
-        </div>
-        
-        <div style="background: #fff3cd; padding: 15px; border-radius: 8px; border-left: 4px solid #ffc107;">
-            <p style="margin: 0; color: #856404;">
-                ⚠️ Please take necessary precautions and stay alert. Monitor local authorities for updates.
-            </p>
-        </div>
-    </div>
-    
-    <div style="background: #343a40; padding: 15px; text-align: center; color: white;">
-        <p style="margin: 0; font-size: 12px;">
-            Hyperlocal Urban Flood Forecaster - Automated Alert System
-        </p>
-    </div>
-</body>
-</html>
-"""
+        # SMS go out concurrently (each request takes a service-wide Twilio
+        # slot), alongside the email, which is one BCC message per batch
+        sms_results, (emails_sent, emails_failed) = await asyncio.gather(
+            asyncio.gather(
+                *(self.send_sms(phone, sms_message) for phone in phone_numbers),
+                return_exceptions=True
+            ),
+            self.send_bulk_email(emails, email_subject, email_body, email_html)
+        )
+        sms_sent, sms_failed = self._count_results(sms_results)
         
-        results = {
-            "sms_sent": 0,
-            "sms_failed": 0,
-            "emails_sent": 0,
-            "emails_failed": 0
+        return {
+            "sms_sent": sms_sent,
+            "sms_failed": sms_failed,
+            "emails_sent": emails_sent,
+            "emails_failed": emails_failed
         }
-        
-        # Send SMS notifications
-        if phone_numbers:
-            for phone in phone_numbers:
-                success = await self.send_sms(phone, sms_message)
-                if success:
-                    results["sms_sent"] += 1
-                else:
-                    results["sms_failed"] += 1
-        
-        # Send email notifications
-        if emails:
-            for email in emails:
-                success = self.send_email(email, email_subject, email_body, email_html)
-                if success:
-                    results["emails_sent"] += 1
-                else:
-                    results["emails_failed"] += 1
-        
-        return results
+    
+    @staticmethod
+    def _count_results(results: List[object]) -> Tuple[int, int]:
+        """Count (sent, failed) results; exceptions count as failures."""
+        sent = sum(1 for result in results if result is True)
+        return sent, len(results) - sent
     
     async def send_test_notification(self, phone: Optional[str] = None, email: Optional[str] = None) -> dict:
         """
@@ -236,7 +452,7 @@ This is an automated alert from the Hyperlocal Urban Flood Forecaster.
             )
         
         if email:
-            results["email_success"] = self.send_email(
+            results["email_success"] = await self.send_email(
                 email,
                 "🌊 Test Notification - Flood Forecaster",
                 "This is a test notification from the Hyperlocal Urban Flood Forecaster.\n\nYour email alerts are configured correctly!",
@@ -246,5 +462,15 @@ This is an automated alert from the Hyperlocal Urban Flood Forecaster.
         return results
 
 
+@lru_cache
+def get_notification_service() -> NotificationService:
+    """
+    Return the process-wide NotificationService.
+    Its HTTP client and SMTP sessions stay warm across requests; use as a
+    FastAPI dependency (override in tests via app.dependency_overrides).
+    """
+    return NotificationService()
+
+
 # Global notification service instance
-notification_service = NotificationService()
+notification_service = get_notification_service()
@@ -0,0 +1,97 @@
+"""
+Pool of persistent, authenticated SMTP sessions.
+Reuses connections across emails so STARTTLS + LOGIN happen once per
+session instead of once per message.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from email.message import Message
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import aiosmtplib
+
+RefusedRecipients = Dict[str, aiosmtplib.SMTPResponse]
+
+
+class SMTPPool:
+    """
+    Pool of up to `size` logged-in aiosmtplib sessions on the running event loop.
+    Sessions are opened lazily, lent to one sender at a time (SMTP is
+    stateful) and replaced when the server drops them.
+    """
+
+    def __init__(self, server: str, port: int, username: str, password: str, size: int = 5):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self._idle: List[aiosmtplib.SMTP] = []
+        # Created on first acquire so it binds to the running event loop,
+        # not whichever one is current when the pool is built at import
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open and authenticate a new session."""
+        smtp = aiosmtplib.SMTP(hostname=self.server, port=self.port, start_tls=True, timeout=30)
+        await smtp.connect()
+        try:
+            await smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Borrow a session (waits while all `size` sessions are in use).
+        The session is returned to the pool on success and discarded if the
+        block raises, since its state is then unknown.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            smtp = self._idle.pop() if self._idle else await self._connect()
+            try:
+                yield smtp
+            except BaseException:
+                smtp.close()
+                raise
+            self._idle.append(smtp)
+
+    async def _send(self, send: Callable[[aiosmtplib.SMTP], Awaitable[RefusedRecipients]]) -> RefusedRecipients:
+        """
+        Await send(session) on a pooled session. A session that fails is
+        discarded (the next send opens a fresh one); retrying is left to
+        the caller.
+
+        Returns:
+            Recipients the server refused
+        """
+        async with self.acquire() as smtp:
+            return await send(smtp)
+
+    async def send_message(self, msg: Message, to_addrs: Optional[List[str]] = None) -> RefusedRecipients:
+        """Send an email.message object (serialized on every call)."""
+        async def send(smtp: aiosmtplib.SMTP) -> RefusedRecipients:
+            refused, _ = await smtp.send_message(msg, recipients=to_addrs)
+            return refused
+        return await self._send(send)
+
+    async def sendmail(self, from_addr: str, to_addrs: List[str], payload: bytes) -> RefusedRecipients:
+        """Send an already-serialized message, so repeated sends skip MIME encoding."""
+        async def send(smtp: aiosmtplib.SMTP) -> RefusedRecipients:
+            refused, _ = await smtp.sendmail(from_addr, to_addrs, payload)
+            return refused
+        return await self._send(send)
+
+    async def close(self):
+        """Log out of every idle session."""
+        while self._idle:
+            smtp = self._idle.pop()
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
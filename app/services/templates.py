@@ -0,0 +1,152 @@
+"""
+Notification message templates.
+Parsed once at import time; rendering is a single substitution pass.
+"""
+
+from html import escape
+from string import Template
+from typing import Tuple
+
+from ..schemas import AlertSubscriptionCreate
+
+
+SUBSCRIPTION_CONFIRMATION_SUBJECT = "🌊 Flood Alert Subscription Confirmed"
+
+SUBSCRIPTION_CONFIRMATION_TEXT = Template(
+    "You're now subscribed to flood alerts for location ($latitude, $longitude) "
+    "within ${radius_km}km radius."
+)
+
+SUBSCRIPTION_CONFIRMATION_HTML = Template("""
+            <h2>🌊 Subscription Confirmed</h2>
+            <p>You're now subscribed to flood alerts for:</p>
+            <ul>
+                <li><strong>Location:</strong> $latitude, $longitude</li>
+                <li><strong>Radius:</strong> $radius_km km</li>
+                <li><strong>Minimum Severity:</strong> $min_severity</li>
+            </ul>
+            <p>You'll receive alerts via email when floods are detected in your area.</p>
+            """)
+
+
+FLOOD_ALERT_SMS = Template(
+    "🌊 FLOOD ALERT: $risk_level risk at $location_name\n"
+    "Risk Score: $risk_score/100\n"
+    "Location: $latitude, $longitude\n"
+    "Take necessary precautions."
+)
+
+FLOOD_ALERT_SUBJECT = Template("🌊 Flood Alert: $risk_level Risk at $location_name")
+
+FLOOD_ALERT_TEXT = Template("""
+Flood Risk Alert
+
+Location: $location_name
+Risk Level: $risk_level
+Risk Score: $risk_score/100
+Coordinates: $latitude, $longitude
+
+Please take necessary precautions and stay safe.
+
+This is an automated alert from the Hyperlocal Urban Flood Forecaster.
+""")
+
+FLOOD_ALERT_HTML = Template("""
+<html>
+<body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; text-align: center;">
+        <h1 style="color: white; margin: 0;">🌊 Flood Risk Alert</h1>
+    </div>
+    
+    <div style="padding: 20px; background-color: #f8f9fa;">
+        <div style="background: white; padding: 20px; border-radius: 8px; margin-bottom: 20px;">
+            <h2 style="color: $risk_color;">
+                $risk_level Risk Level
+            </h2>
+            <p><strong>Location:</strong> $location_name</p>
+            <p><strong>Risk Score:</strong> $risk_score/100</p>
+            <p><strong>Coordinates:</strong> $latitude, $longitude</p>
+        </div>
+        
+        <div style="background: #fff3cd; padding: 15px; border-radius: 8px; border-left: 4px solid #ffc107;">
+            <p style="margin: 0; color: #856404;">
+                ⚠️ Please take necessary precautions and stay alert. Monitor local authorities for updates.
+            </p>
+        </div>
+    </div>
+    
+    <div style="background: #343a40; padding: 15px; text-align: center; color: white;">
+        <p style="margin: 0; font-size: 12px;">
+            Hyperlocal Urban Flood Forecaster - Automated Alert System
+        </p>
+    </div>
+</body>
+</html>
+""")
+
+# Heading color per risk level in the alert email
+RISK_COLORS = {
+    "Critical": "#dc3545",
+    "High": "#dc3545",
+    "Medium": "#ffc107",
+    "Low": "#28a745",
+}
+
+
+def render_flood_alert(
+    location_name: str,
+    risk_level: str,
+    risk_score: float,
+    latitude: float,
+    longitude: float
+) -> Tuple[str, str, str, str]:
+    """
+    Render every variant of a flood alert.
+    
+    Args:
+        location_name: Name of the location
+        risk_level: Severity level (Low/Medium/High/Critical)
+        risk_score: Risk score (0-100)
+        latitude: Location latitude
+        longitude: Location longitude
+    
+    Returns:
+        Tuple of (SMS message, email subject, plain text body, HTML body)
+    """
+    values = {
+        "location_name": location_name,
+        "risk_level": risk_level,
+        "risk_score": f"{risk_score:.1f}",
+        "latitude": f"{latitude:.4f}",
+        "longitude": f"{longitude:.4f}",
+    }
+    html_values = {key: escape(value) for key, value in values.items()}
+    return (
+        FLOOD_ALERT_SMS.substitute(values),
+        FLOOD_ALERT_SUBJECT.substitute(values),
+        FLOOD_ALERT_TEXT.substitute(values),
+        FLOOD_ALERT_HTML.substitute(html_values, risk_color=RISK_COLORS.get(risk_level, "#28a745")),
+    )
+
+
+def render_subscription_confirmation(subscription: AlertSubscriptionCreate) -> Tuple[str, str]:
+    """
+    Render the subscription confirmation email.
+    
+    Args:
+        subscription: Subscription that was just created
+    
+    Returns:
+        Tuple of (plain text body, HTML body); values are HTML-escaped in the HTML body
+    """
+    values = {
+        "latitude": subscription.latitude,
+        "longitude": subscription.longitude,
+        "radius_km": subscription.radius_km,
+        "min_severity": subscription.min_severity,
+    }
+    html_values = {key: escape(str(value)) for key, value in values.items()}
+    return (
+        SUBSCRIPTION_CONFIRMATION_TEXT.substitute(values),
+        SUBSCRIPTION_CONFIRMATION_HTML.substitute(html_values),
+    )
@@ -3,12 +3,20 @@ from .auth import (
     verify_password,
     get_password_hash,
     create_access_token,
-    decode_access_token
+    decode_access_token,
+    get_token_payload
 )
+from .http_cache import weak_etag, body_etag, content_etag, is_not_modified, not_modified_response
 
 __all__ = [
     "verify_password",
     "get_password_hash",
     "create_access_token",
-    "decode_access_token"
+    "decode_access_token",
+    "get_token_payload",
+    "weak_etag",
+    "body_etag",
+    "content_etag",
+    "is_not_modified",
+    "not_modified_response"
 ]
@@ -3,7 +3,7 @@ JWT authentication utilities.
 Provides functions for password hashing and JWT token management.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -12,6 +12,9 @@ from ..config import settings
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Default token lifetime, computed once from settings
+_DEFAULT_TOKEN_LIFETIME = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -53,10 +56,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    if expires_delta is None:
+        expires_delta = _DEFAULT_TOKEN_LIFETIME
+    expire = datetime.now(timezone.utc) + expires_delta
     
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -64,6 +66,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def get_token_payload(token: str) -> Optional[dict]:
+    """
+    Decode and verify a JWT token, returning all claims.
+    
+    Args:
+        token: JWT token string
+    
+    Returns:
+        Token claims (including "sub" and "exp"), or None if invalid
+    """
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+
+
 def decode_access_token(token: str) -> Optional[str]:
     """
     Decode and verify a JWT token.
@@ -74,9 +92,7 @@ def decode_access_token(token: str) -> Optional[str]:
     Returns:
         Username (subject) from token, or None if invalid
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        return username
-    except JWTError:
+    payload = get_token_payload(token)
+    if payload is None:
         return None
+    return payload.get("sub")
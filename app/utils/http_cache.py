@@ -0,0 +1,78 @@
+"""
+HTTP caching utilities.
+Provides helpers for weak ETags and conditional (If-None-Match) requests.
+"""
+
+from hashlib import blake2b
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+def weak_etag(*parts) -> str:
+    """
+    Build a weak ETag from the values that determine a response.
+    
+    Args:
+        parts: Values identifying the response version (IDs, timestamps, query params)
+    
+    Returns:
+        ETag header value, e.g. W/"3f2a..."
+    """
+    digest = blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def body_etag(payload: bytes) -> str:
+    """
+    Build a weak ETag by hashing serialized response bytes.
+    
+    Args:
+        payload: Response body exactly as it will be sent
+    
+    Returns:
+        ETag header value, e.g. W/"3f2a..."
+    """
+    digest = blake2b(payload, digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def content_etag(body: BaseModel) -> str:
+    """
+    Build a weak ETag by hashing a serialized response body, so it changes
+    whenever any returned field does (timestamps alone can repeat within
+    the database's clock resolution).
+    
+    Args:
+        body: Response model exactly as it will be returned
+    
+    Returns:
+        ETag header value, e.g. W/"3f2a..."
+    """
+    return body_etag(body.model_dump_json().encode())
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match header matches the ETag.
+    
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+    
+    Returns:
+        True if a 304 Not Modified response can be returned
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    """Build an empty 304 response carrying the caching headers."""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
@@ -3,19 +3,52 @@ Main FastAPI application entry point.
 Hyperlocal Urban Flood Forecaster Backend API.
 """
 
-from fastapi import FastAPI
+import importlib
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from app.database import init_db
 from app.config import settings
-from app.routers import floods
-from app.routers import auth
-from app.routers import notifications
-from app.routers import map
-from app.routers import alerts
-from app.routers import route_verdict
-from app.routers import chat
+
+# Service singletons closed on shutdown: (module, attribute). They are
+# imported lazily by the routers, so only ones actually loaded are closed
+SERVICES = [
+    ("app.services.flood_risk", "flood_risk_service"),
+    ("app.services.notification", "notification_service"),
+]
+
+
+def start_log_listener() -> QueueListener:
+    """
+    Route the app.* loggers through a queue drained by a background thread,
+    so request handlers and notification fan-out never block on stderr.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.LOG_LEVEL)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+    
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def stop_log_listener(listener: QueueListener):
+    """Flush queued log records and detach the queue handler."""
+    listener.stop()
+    app_logger = logging.getLogger("app")
+    for handler in [h for h in app_logger.handlers if isinstance(h, QueueHandler)]:
+        app_logger.removeHandler(handler)
+    app_logger.propagate = True
 
 
 @asynccontextmanager
@@ -24,10 +57,14 @@ async def lifespan(app: FastAPI):
     Application lifespan events.
     Handles startup and shutdown tasks.
     """
+    log_listener = start_log_listener()
+    
     # Startup: Initialize database
     print("🚀 Starting Hyperlocal Urban Flood Forecaster API...")
     print(f"📊 Initializing database...")
     try:
+        # Creates missing tables only; schema changes to existing tables come
+        # from `alembic upgrade head`, run by the start command before this
         init_db()
         print("✅ Database initialized successfully")
     except Exception as e:
@@ -39,6 +76,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("🛑 Shutting down API...")
+    for module_name, service_name in SERVICES:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            await getattr(module, service_name).aclose()
+    stop_log_listener(log_listener)
 
 
 # Create FastAPI application
@@ -76,32 +118,67 @@ app = FastAPI(
 )
 
 # Configure CORS for frontend integration
-# Support both localhost for development and production URLs
-cors_origins = settings.cors_origins
-# Add common Netlify patterns
-if any("localhost" in o for o in cors_origins):
-    cors_origins.extend([
-        "https://*.netlify.app",
-        "https://floodauraaa.netlify.app",
-        "https://floodaura.netlify.app",
-    ])
-
+# Explicit origins from ALLOWED_ORIGINS plus CORS_ORIGIN_REGEX (the project's
+# Netlify sites and previews); credentials require echoing a concrete origin
+# rather than "*"
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for now (update for production)
+    allow_origins=settings.cors_origins,
+    allow_origin_regex=settings.CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["ETag"],  # Lets the frontend send If-None-Match
+    max_age=86400,  # Browsers may cache preflight responses for a day
 )
 
-# Include routers
-app.include_router(floods.router, prefix="/api/v1")
-app.include_router(auth.router, prefix="/api/v1")
-app.include_router(notifications.router, prefix="/api/v1")
-app.include_router(map.router, prefix="/api/v1")
-app.include_router(alerts.router, prefix="/api/v1")
-app.include_router(route_verdict.router, prefix="/api")
-app.include_router(chat.router, prefix="/api")
+# Include routers: (module in app.routers, prefix). Modules listed in
+# DISABLED_ROUTERS are skipped without being imported
+ROUTERS = [
+    ("floods", "/api/v1"),
+    ("auth", "/api/v1"),
+    ("notifications", "/api/v1"),
+    ("map", "/api/v1"),
+    ("alerts", "/api/v1"),
+    ("route_verdict", "/api"),
+    ("chat", "/api"),
+]
+
+for module_name, prefix in ROUTERS:
+    if module_name in settings.disabled_routers:
+        continue
+    module = importlib.import_module(f"app.routers.{module_name}")
+    app.include_router(module.router, prefix=prefix)
+
+
+# Bodies of the constant endpoints below, serialized once at import. A
+# fresh Response is built per request because middleware (CORS) mutates the
+# headers of the response it sends
+ROOT_BODY = JSONResponse({
+    "message": "Hyperlocal Urban Flood Forecaster API",
+    "version": "1.0.0",
+    "status": "operational",
+    "docs": "/docs",
+    "endpoints": {
+        "floods": "/api/v1/floods",
+        "calculate_risk": "/api/v1/floods/calculate-risk",
+        "auth": "/api/v1/auth"
+    }
+}).body
+
+HEALTH_BODY = JSONResponse({
+    "status": "healthy",
+    "service": "flood-forecaster-api",
+    "database": "connected"
+}).body
+
+TEST_CONNECTION_BODY = JSONResponse({
+    "status": "success",
+    "message": "Backend connected successfully!",
+    "timestamp": "2026-01-10T00:00:00Z",
+    "cors_enabled": True,
+    "api_version": "1.0.0"
+}).body
 
 
 @app.get("/")
@@ -109,17 +186,7 @@ async def root():
     """
     Root endpoint - API health check and information.
     """
-    return {
-        "message": "Hyperlocal Urban Flood Forecaster API",
-        "version": "1.0.0",
-        "status": "operational",
-        "docs": "/docs",
-        "endpoints": {
-            "floods": "/api/v1/floods",
-            "calculate_risk": "/api/v1/floods/calculate-risk",
-            "auth": "/api/v1/auth"
-        }
-    }
+    return Response(ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
@@ -127,11 +194,7 @@ async def health_check():
     """
     Health check endpoint for monitoring.
     """
-    return {
-        "status": "healthy",
-        "service": "flood-forecaster-api",
-        "database": "connected"
-    }
+    return Response(HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/api/test-connection")
@@ -139,13 +202,7 @@ async def test_connection():
     """
     Test endpoint to verify frontend-backend connection.
     """
-    return {
-        "status": "success",
-        "message": "Backend connected successfully!",
-        "timestamp": "2026-01-10T00:00:00Z",
-        "cors_enabled": True,
-        "api_version": "1.0.0"
-    }
+    return Response(TEST_CONNECTION_BODY, media_type="application/json")
 
 
 @app.exception_handler(404)
@@ -1,25 +1,20 @@
 """
 Alembic configuration for database migrations.
-Run this script to set up Alembic for your project.
+Run this script to see how to apply migrations for your project.
 """
 
-# To initialize Alembic:
-# 1. Run: alembic init alembic
-# 2. Update alembic/env.py to import your models
-# 3. Update alembic.ini with your database URL (or use environment variable)
-# 4. Generate migration: alembic revision --autogenerate -m "Initial migration"
-# 5. Apply migration: alembic upgrade head
-
-# Example alembic/env.py modification:
-"""
-from app.database import Base
-from app import models  # Import all models
-
-target_metadata = Base.metadata
-"""
+# Alembic is already configured:
+# - alembic.ini points at the alembic/ directory
+# - alembic/env.py reads DATABASE_URL from app.config and imports all models
+# - alembic/versions/ holds the migrations
+#
+# To apply migrations: alembic upgrade head
+# To generate a new migration: alembic revision --autogenerate -m "Describe change"
+#
+# Migrations are written to be safe on databases whose tables were first
+# created by app.database.init_db().
 
 print("Alembic setup instructions:")
-print("1. Run: alembic init alembic")
-print("2. Update alembic/env.py with your models")
-print("3. Generate migration: alembic revision --autogenerate -m 'Initial migration'")
-print("4. Apply migration: alembic upgrade head")
+print("1. Configure DATABASE_URL in .env")
+print("2. Apply migrations: alembic upgrade head")
+print("3. Generate new migration: alembic revision --autogenerate -m 'Describe change'")
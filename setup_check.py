@@ -3,6 +3,7 @@ Setup script to help initialize the Flood Forecaster backend.
 Run this after installing dependencies and configuring .env
 """
 
+import importlib.util
 import sys
 import os
 from pathlib import Path
@@ -32,23 +33,24 @@ def check_env_file():
 
 def check_dependencies():
     """Check if required packages are installed."""
-    required_packages = [
-        "fastapi",
-        "uvicorn",
-        "sqlalchemy",
-        "psycopg2",
-        "pydantic",
-        "httpx",
-        "python-jose",
-        "passlib"
-    ]
+    # pip package name -> importable module name
+    required_packages = {
+        "fastapi": "fastapi",
+        "uvicorn": "uvicorn",
+        "sqlalchemy": "sqlalchemy",
+        "psycopg2": "psycopg2",
+        "pydantic": "pydantic",
+        "httpx": "httpx",
+        "python-jose": "jose",
+        "passlib": "passlib",
+    }
     
+    # find_spec only locates each module; nothing is imported or executed
     missing = []
-    for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
+    for package, module in required_packages.items():
+        if importlib.util.find_spec(module) is not None:
             print(f"✅ {package} installed")
-        except ImportError:
+        else:
             missing.append(package)
             print(f"❌ {package} not installed")
     
@@ -97,18 +99,28 @@ def check_database_config():
         return False
 
 
+# Connection opened by check_database_connection and reused by
+# initialize_database, so setup talks to the database over one connection
+_connection = None
+
+
 def check_database_connection():
     """Test database connection."""
+    global _connection
     try:
         from app.database import engine
         from sqlalchemy import text
         
-        with engine.connect() as connection:
-            connection.execute(text("SELECT 1"))
+        _connection = engine.connect()
+        _connection.execute(text("SELECT 1"))
         
         print("✅ Database connection successful")
         return True
     except Exception as e:
+        # Don't hand a broken connection to initialize_database
+        if _connection is not None:
+            _connection.close()
+            _connection = None
         print(f"❌ Database connection failed: {e}")
         print("   Make sure PostgreSQL is running and DATABASE_URL is correct")
         return False
@@ -118,7 +130,11 @@ def initialize_database():
     """Initialize database tables."""
     try:
         from app.database import init_db
-        init_db()
+        if _connection is None:
+            init_db()
+        else:
+            init_db(_connection)
+            _connection.commit()
         print("✅ Database tables initialized")
         return True
     except Exception as e:
@@ -143,10 +159,14 @@ def main():
     ]
     
     results = []
-    for name, check_func in checks:
-        print(f"\n📋 Checking {name}...")
-        results.append(check_func())
-        print()
+    try:
+        for name, check_func in checks:
+            print(f"\n📋 Checking {name}...")
+            results.append(check_func())
+            print()
+    finally:
+        if _connection is not None:
+            _connection.close()
     
     print("=" * 60)
     if all(results):
@@ -0,0 +1,50 @@
+"""
+Shared pytest fixtures for the Flood Forecaster API tests.
+"""
+
+import os
+
+# The test database is SQLite, which has no PostGIS; pick the
+# extension-free spatial backend before the app (and its models) load
+os.environ.setdefault("SPATIAL_BACKEND", "bbox")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session, raiseload
+
+from main import app
+
+
+def _raise_on_lazy_load(orm_execute_state):
+    """Add raiseload("*") to every top-level ORM SELECT."""
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*", sql_only=True)
+        )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_lazy_loads():
+    """
+    Make any lazy relationship load in CRUD code raise instead of silently
+    issuing one query per row (N+1). Relationships must be eager-loaded
+    explicitly, e.g. with selectinload().
+    """
+    event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
+    yield
+    event.remove(Session, "do_orm_execute", _raise_on_lazy_load)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    TestClient shared by the whole session; the app lifespan (database
+    init, service clients) runs once instead of per test.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
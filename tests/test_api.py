@@ -3,14 +3,21 @@ Example test file for the Flood Forecaster API.
 Run with: pytest tests/
 """
 
+import asyncio
+import uuid
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from main import app
 
-client = TestClient(app)
+from app import crud, models
+from app.database import SessionLocal
+from app.services import notification
+from app.services.flood_risk import flood_risk_service
+from main import app
 
 
-def test_root_endpoint():
+def test_root_endpoint(client):
     """Test the root endpoint returns correct information."""
     response = client.get("/")
     assert response.status_code == 200
@@ -19,7 +26,7 @@ def test_root_endpoint():
     assert "version" in data
 
 
-def test_health_check():
+def test_health_check(client):
     """Test the health check endpoint."""
     response = client.get("/health")
     assert response.status_code == 200
@@ -27,8 +34,21 @@ def test_health_check():
     assert data["status"] == "healthy"
 
 
-def test_create_flood_event():
-    """Test creating a flood event."""
+@pytest.mark.parametrize(
+    "origin, allowed",
+    [
+        ("https://floodaura.netlify.app", True),
+        ("https://deploy-preview-7--floodauraaa.netlify.app", True),
+        ("https://someone-else.netlify.app", False),
+    ]
+)
+def test_cors_origins(client, origin, allowed):
+    """Test credentialed CORS is granted only to the project's own sites."""
+    response = client.get("/health", headers={"Origin": origin})
+    assert (response.headers.get("access-control-allow-origin") == origin) is allowed
+
+def test_create_flood_event(client):
+    """Test creating a flood event (risk is calculated in the background)."""
     flood_data = {
         "location_name": "Test Street",
         "latitude": 40.7128,
@@ -36,14 +56,14 @@ def test_create_flood_event():
         "description": "Test flood event"
     }
     response = client.post("/api/v1/floods/", json=flood_data)
-    assert response.status_code == 201
+    assert response.status_code == 202
     data = response.json()
     assert data["location_name"] == "Test Street"
     assert "risk_score" in data
     assert "severity" in data
 
 
-def test_get_flood_events():
+def test_get_flood_events(client):
     """Test retrieving flood events."""
     response = client.get("/api/v1/floods/")
     assert response.status_code == 200
@@ -51,7 +71,7 @@ def test_get_flood_events():
     assert isinstance(data, list)
 
 
-def test_calculate_risk():
+def test_calculate_risk(client):
     """Test risk calculation without saving."""
     risk_data = {
         "latitude": 40.7128,
@@ -67,7 +87,7 @@ def test_calculate_risk():
     assert data["risk_score"] <= 100
 
 
-def test_invalid_coordinates():
+def test_invalid_coordinates(client):
     """Test validation for invalid coordinates."""
     invalid_data = {
         "location_name": "Invalid Location",
@@ -78,4 +98,360 @@ def test_invalid_coordinates():
     assert response.status_code == 422  # Validation error
 
 
+def _reference_risk_score(rainfall_mm, elevation_m):
+    """The original if/elif scoring that the threshold tables replaced."""
+    if rainfall_mm < 5:
+        rainfall_score = 10
+    elif rainfall_mm < 15:
+        rainfall_score = 20
+    elif rainfall_mm < 30:
+        rainfall_score = 35
+    elif rainfall_mm < 50:
+        rainfall_score = 50
+    else:
+        rainfall_score = 60
+    
+    if elevation_m < 10:
+        elevation_score = 40
+    elif elevation_m < 50:
+        elevation_score = 30
+    elif elevation_m < 100:
+        elevation_score = 20
+    elif elevation_m < 200:
+        elevation_score = 10
+    else:
+        elevation_score = 5
+    
+    total_score = rainfall_score + elevation_score
+    if total_score <= 25:
+        severity = "Low"
+    elif total_score <= 50:
+        severity = "Medium"
+    elif total_score <= 75:
+        severity = "High"
+    else:
+        severity = "Critical"
+    return total_score, severity
+
+
+def test_risk_score_matches_reference_thresholds():
+    """Test bisect scoring agrees with the if/elif thresholds, boundaries included."""
+    rainfall_values = [0, 4.9, 5, 14.9, 15, 29.9, 30, 49.9, 50, 120]
+    elevation_values = [-5, 9.9, 10, 49.9, 50, 99.9, 100, 199.9, 200, 900]
+    pairs = [(rain, elev) for rain in rainfall_values for elev in elevation_values]
+    
+    expected = [_reference_risk_score(rain, elev) for rain, elev in pairs]
+    assert [flood_risk_service.calculate_risk_score(rain, elev) for rain, elev in pairs] == expected
+    assert flood_risk_service.calculate_risk_scores_batch(
+        [rain for rain, _ in pairs], [elev for _, elev in pairs]
+    ) == expected
+    
+    with pytest.raises(ValueError):
+        flood_risk_service.calculate_risk_scores_batch([1, 2], [3])
+
+
+def test_sms_slot_released_during_backoff(monkeypatch):
+    """Test a retrying SMS does not hold its Twilio slot while backing off."""
+    service = notification.NotificationService()
+    service.twilio_sid, service.twilio_token, service.twilio_phone = "AC1", "token", "+15550100000"
+    statuses = iter([429, 201])
+    slot_held_while_sleeping = []
+    
+    async def fake_sleep(delay):
+        slot_held_while_sleeping.append(service.sms_slots.locked())
+    
+    async def send():
+        service._sms_slots = asyncio.Semaphore(1)
+        service._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(next(statuses)))
+        )
+        try:
+            return await service.send_flood_alert(
+                "Test Street", "High", 70.0, 12.5, 45.5, ["+15550100001"], []
+            )
+        finally:
+            await service.aclose()
+    
+    monkeypatch.setattr(notification.asyncio, "sleep", fake_sleep)
+    assert asyncio.run(send())["sms_sent"] == 1
+    assert slot_held_while_sleeping == [False]
+
+def test_unique_recipients():
+    """Test duplicate recipients are dropped but sent as originally entered."""
+    phones, emails = notification._unique_recipients(
+        ["+1 (555) 010-0001", "+15550100001", "555-010-0002 ext. 7", "555 010 00027", "n/a"],
+        [" Alice@Example.com", "alice@example.com", "bob@example.com"]
+    )
+    assert phones == ["+1 (555) 010-0001", "555-010-0002 ext. 7"]
+    assert emails == ["Alice@Example.com", "bob@example.com"]
+
+
+def test_retry_transient_backoff(monkeypatch):
+    """Test only transient failures are retried, with growing backoff."""
+    delays = []
+    
+    async def fake_sleep(delay):
+        delays.append(delay)
+    
+    monkeypatch.setattr(notification.asyncio, "sleep", fake_sleep)
+    request = httpx.Request("POST", "https://api.twilio.com/")
+    
+    attempts = []
+    
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise httpx.ConnectError("refused", request=request)
+        return "sent"
+    
+    assert asyncio.run(notification._retry_transient(flaky, "test send")) == "sent"
+    assert len(attempts) == 3
+    assert [int(delay * 2) for delay in delays] in ([1, 2], [1, 3], [2, 2], [2, 3])
+    assert notification.RETRY_INITIAL_DELAY <= delays[0] < notification.RETRY_INITIAL_DELAY + 1
+    assert 2 * notification.RETRY_INITIAL_DELAY <= delays[1] < 2 * notification.RETRY_INITIAL_DELAY + 1
+    
+    # A read timeout may already have been delivered: never resent
+    attempts.clear()
+    
+    async def timed_out():
+        attempts.append(1)
+        raise httpx.ReadTimeout("timed out", request=request)
+    
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(notification._retry_transient(timed_out, "test send"))
+    assert len(attempts) == 1
+    
+    # Transient failures give up after SEND_MAX_ATTEMPTS
+    attempts.clear()
+    
+    async def always_down():
+        attempts.append(1)
+        raise notification.TransientSendError("503")
+    
+    with pytest.raises(notification.TransientSendError):
+        asyncio.run(notification._retry_transient(always_down, "test send"))
+    assert len(attempts) == notification.SEND_MAX_ATTEMPTS
+
+
+def _recording_service(monkeypatch, pool_size):
+    """NotificationService with SMTP configured whose batch sends are recorded, not sent."""
+    service = notification.NotificationService()
+    service.smtp_email, service.smtp_password = "alerts@example.com", "secret"
+    service._smtp_pool.size = pool_size
+    batches = []
+    
+    async def fake_batch(payload, batch):
+        batches.append((payload, batch))
+        return len(batch), 0
+    
+    monkeypatch.setattr(service, "_send_email_batch", fake_batch)
+    return service, batches
+
+
+def test_bulk_email_bcc_batches(monkeypatch):
+    """Test bulk email is one BCC message per batch, encoded once, addresses hidden."""
+    service, batches = _recording_service(monkeypatch, pool_size=1)
+    emails = [f"user{i}@example.com" for i in range(120)]
+    
+    sent, failed = asyncio.run(service.send_bulk_email(emails, "Alert", "body", batch_size=50))
+    assert (sent, failed) == (120, 0)
+    assert len(batches) == 3
+    assert all(len(batch) <= 50 for _, batch in batches)
+    assert [email for _, batch in batches for email in batch] == emails
+    
+    payloads = {payload for payload, _ in batches}
+    assert len(payloads) == 1
+    payload = payloads.pop()
+    assert b"To: alerts@example.com" in payload
+    assert not any(email.encode() in payload for email in emails)
+
+
+@pytest.mark.parametrize(
+    "recipients, batch_size, expected_sizes",
+    [
+        (3, 50, [1, 1, 1]),
+        (12, 50, [3, 3, 3, 3]),
+        (120, 50, [24, 24, 24, 24, 24]),
+        (260, 50, [44, 44, 44, 44, 44, 40]),
+    ]
+)
+def test_bulk_email_spreads_over_pool(monkeypatch, recipients, batch_size, expected_sizes):
+    """Test BCC batches are spread evenly over the pooled sessions."""
+    service, batches = _recording_service(monkeypatch, pool_size=5)
+    emails = [f"user{i}@example.com" for i in range(recipients)]
+    
+    sent, failed = asyncio.run(service.send_bulk_email(emails, "Alert", "body", batch_size=batch_size))
+    assert (sent, failed) == (recipients, 0)
+    assert [len(batch) for _, batch in batches] == expected_sizes
+    assert [email for _, batch in batches for email in batch] == emails
+
+
+def test_flood_event_etag(client):
+    """Test flood event and list ETags revalidate and change with the body."""
+    db = SessionLocal()
+    try:
+        event = models.FloodEvent(
+            location_name="ETag Street", latitude=12.5, longitude=45.5,
+            severity=models.SeverityLevel.LOW, severity_level=0, risk_score=10
+        )
+        db.add(event)
+        db.commit()
+        
+        url = f"/api/v1/floods/{event.id}"
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+        
+        list_etag = client.get("/api/v1/floods/").headers["ETag"]
+        assert client.get("/api/v1/floods/", headers={"If-None-Match": list_etag}).status_code == 304
+        
+        # Same-second update: updated_at may not change, the body does
+        event.risk_score = 55
+        db.commit()
+        changed = client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["risk_score"] == 55
+        assert changed.headers["ETag"] != etag
+        
+        changed_list = client.get("/api/v1/floods/", headers={"If-None-Match": list_etag})
+        assert changed_list.status_code == 200
+        assert changed_list.headers["ETag"] != list_etag
+    finally:
+        db.close()
+
+
+def test_subscription_etag(client):
+    """Test GET /subscriptions/{id} revalidates with ETag and changes after an update."""
+    created = client.post(
+        "/api/v1/notifications/subscribe",
+        json={"email": f"{uuid.uuid4().hex}@example.com", "latitude": 12.5, "longitude": 45.5}
+    )
+    assert created.status_code == 201
+    url = f"/api/v1/notifications/subscriptions/{created.json()['id']}"
+    
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    
+    assert client.put(url, json={"min_severity": "High"}).status_code == 200
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["min_severity"] == "High"
+    assert changed.headers["ETag"] != etag
+
+
+def test_subscriber_cache_invalidation(client):
+    """Test cached alert candidates follow subscription create, update and delete."""
+    email = f"{uuid.uuid4().hex}@example.com"
+    latitude, longitude = -33.8, 151.2
+    
+    def notified(severity="High"):
+        db = SessionLocal()
+        try:
+            rows = crud.get_cached_subscriptions_near_location(db, latitude, longitude, severity)
+            return email in {row.email for row in rows}
+        finally:
+            db.close()
+    
+    assert not notified()  # Caches the cell without the new subscriber
+    
+    created = client.post(
+        "/api/v1/notifications/subscribe",
+        json={"email": email, "latitude": latitude, "longitude": longitude, "min_severity": "Medium"}
+    )
+    assert created.status_code == 201
+    assert notified()
+    
+    url = f"/api/v1/notifications/subscriptions/{created.json()['id']}"
+    assert client.put(url, json={"min_severity": "Critical"}).status_code == 200
+    assert not notified()
+    assert client.put(url, json={"min_severity": "Low"}).status_code == 200
+    assert notified()
+    
+    assert client.delete(url).status_code == 200
+    assert not notified()
+
+
+@pytest.mark.parametrize(
+    "subscriber, event, far",
+    [
+        # Across the antimeridian, both ways
+        ((0.0, 179.95), (0.0, -179.95), (0.0, -179.5)),
+        ((0.0, -179.95), (0.0, 179.95), (0.0, 179.5)),
+        # Over the poles (~11 km apart; the far point is ~120 km away)
+        ((89.95, 0.0), (89.95, 180.0), (88.95, 180.0)),
+        ((-89.95, 90.0), (-89.95, -90.0), (-88.95, -90.0)),
+    ]
+)
+def test_subscriptions_near_location_wraps(client, subscriber, event, far):
+    """Test the bounding-box search finds subscribers across the antimeridian and poles."""
+    email = f"{uuid.uuid4().hex}@example.com"
+    created = client.post(
+        "/api/v1/notifications/subscribe",
+        json={
+            "email": email, "latitude": subscriber[0], "longitude": subscriber[1],
+            "radius_km": 20, "min_severity": "Low"
+        }
+    )
+    assert created.status_code == 201
+    
+    db = SessionLocal()
+    try:
+        near = crud.get_subscriptions_near_location(db, event[0], event[1], "Low")
+        distant = crud.get_subscriptions_near_location(db, far[0], far[1], "Low")
+    finally:
+        db.close()
+    assert email in {row.email for row in near}
+    assert email not in {row.email for row in distant}
+
+
+def test_list_subscriptions_streams_json(client):
+    """Test the streamed subscription list is a complete JSON array."""
+    email = f"{uuid.uuid4().hex}@example.com"
+    created = client.post(
+        "/api/v1/notifications/subscribe",
+        json={"email": email, "latitude": 12.5, "longitude": 45.5}
+    )
+    assert created.status_code == 201
+    
+    response = client.get("/api/v1/notifications/subscriptions", params={"limit": 10000})
+    assert response.status_code == 200
+    assert email in {item["email"] for item in response.json()}
+    
+    empty = client.get("/api/v1/notifications/subscriptions", params={"skip": 10000000})
+    assert empty.status_code == 200
+    assert empty.json() == []
+
+
+def test_list_subscriptions_invalid_row_is_500(client):
+    """Test a row that fails validation gives a 500, not a truncated 200."""
+    db = SessionLocal()
+    broken = models.AlertSubscription(
+        email=f"{uuid.uuid4().hex}@example.com", latitude=12.5, longitude=45.5, is_active=1
+    )
+    db.add(broken)
+    db.flush()
+    broken.radius_km = None
+    db.commit()
+    try:
+        response = TestClient(app, raise_server_exceptions=False).get(
+            "/api/v1/notifications/subscriptions",
+            params={"skip": _active_subscriptions_before(db, broken.id), "limit": 1}
+        )
+        assert response.status_code == 500
+    finally:
+        db.delete(broken)
+        db.commit()
+        db.close()
+
+
+def _active_subscriptions_before(db, subscription_id):
+    """Offset of an active subscription in the unordered list query."""
+    ids = [subscription.id for subscription in crud.get_subscriptions(db, limit=1000000)]
+    return ids.index(subscription_id)
+
+
 # Add more tests as needed
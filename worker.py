@@ -0,0 +1,51 @@
+"""
+Notification worker.
+Delivers emails queued by the API (see NotificationService.queue_email)
+so SMTP latency, outages and retries never hold up API workers.
+
+Requires REDIS_URL and arq. Run with:
+    arq worker.WorkerSettings
+"""
+
+import logging
+from typing import Optional
+from arq import Retry
+from arq.connections import RedisSettings
+from app.config import settings
+from app.services.notification import is_transient, notification_service
+
+logger = logging.getLogger(__name__)
+
+# Attempts per email before the job is given up
+MAX_TRIES = 5
+# Seconds to wait before retry N (grows linearly with the attempt number)
+RETRY_BACKOFF_SECONDS = 30
+
+
+async def send_email_job(ctx, to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> bool:
+    """Send one queued email, retrying with backoff if the SMTP send fails transiently."""
+    if not notification_service.email_configured:
+        logger.warning("SMTP credentials not configured. Queued email dropped.")
+        return False
+    
+    # arq owns retries here, so the service does not retry on its own too
+    try:
+        await notification_service.deliver_email(to_email, subject, body, html_body, retry=False)
+    except Exception as e:
+        if is_transient(e):
+            raise Retry(defer=ctx["job_try"] * RETRY_BACKOFF_SECONDS) from e
+        raise  # Permanent rejection: fail the job without retrying
+    return True
+
+
+async def shutdown(ctx) -> None:
+    """Log out of pooled SMTP sessions and close HTTP clients when the worker stops."""
+    await notification_service.aclose()
+
+
+class WorkerSettings:
+    """arq worker configuration."""
+    functions = [send_email_job]
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(settings.REDIS_URL or "redis://localhost:6379")
+    max_tries = MAX_TRIES